@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-18 06:39
+
+from django.db import migrations, models
+from selectolax.lexbor import LexborHTMLParser
+
+
+def html_preview(content, max_length=100):
+    """Frozen copy of models.html_preview; later changes there must not alter this migration."""
+    tree = LexborHTMLParser(content)
+    words = []
+    for node in tree.root.traverse(include_text=True):
+        if node.tag == '-text' and node.parent.tag not in ('script', 'style', 'template'):
+            words.extend(node.text(deep=False).replace(':', '').split())
+    text = ' '.join(words)
+    return text[:max_length] + ('...' if len(text) > max_length else '')
+
+
+def backfill_previews(apps, schema_editor):
+    RichTextMessage = apps.get_model('communication', 'RichTextMessage')
+    messages = list(RichTextMessage.objects.only('id', 'content'))
+    for message in messages:
+        message.preview = html_preview(message.content)
+    RichTextMessage.objects.bulk_update(messages, ['preview'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='richtextmessage',
+            name='preview',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.RunPython(backfill_previews, migrations.RunPython.noop),
+    ]
@@ -2,11 +2,85 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
-from bs4 import BeautifulSoup
+from django.template import Context, Template
+from functools import lru_cache
+from selectolax.lexbor import LexborHTMLParser
+import re
 import uuid
 
 User = get_user_model()
 
+@lru_cache(maxsize=256)
+def _compile_template(source):
+    """Compile template source once; templates are reused for every send."""
+    return Template(source)
+
+
+def _render_template(source, context):
+    """Render template source with the Django engine, autoescaping values."""
+    return _compile_template(source).render(Context(context))
+
+# Only a literal start tag can create a script element, so content without
+# a match needs no script check; a match may still be inside an attribute
+SCRIPT_TAG_RE = re.compile(r'<script\b', re.IGNORECASE)
+
+# Length of the preview stored on each rich text message
+PREVIEW_LENGTH = 100
+
+# Attributes removed from every tag of sanitized HTML
+DISALLOWED_ATTRS = frozenset({'style', 'class'})
+
+# Content without any of these parses to a single text node, so the parser
+# can be skipped; only the leading whitespace it drops needs handling
+_MARKUP_CHARS_RE = re.compile('[<>&\r\x00\xa0]')
+_HTML_LEADING_WHITESPACE = ' \t\n\x0c'
+
+# Text under these tags is not page text and stays out of previews
+_NON_TEXT_PARENTS = frozenset({'script', 'style', 'template'})
+
+# Messages for a missing src and a javascript: src, by tag
+_SRC_ERRORS = {
+    'img': ('Image tags must have a src attribute', 'JavaScript URLs are not allowed in image src'),
+    'iframe': ('Iframe tags must have a src attribute', 'JavaScript URLs are not allowed in iframe src'),
+}
+
+
+class _PreviewText:
+    """Collects preview words from text nodes, stopping once the preview is full."""
+
+    def __init__(self, max_length):
+        self.max_length = max_length
+        self.words = []
+        self.length = -1  # Length of the words joined by single spaces
+
+    def add(self, node):
+        if node.parent.tag not in _NON_TEXT_PARENTS:
+            self.add_text(node.text(deep=False))
+
+    def add_text(self, text):
+        if self.length > self.max_length:
+            return
+        # Remove colons and normalize whitespace
+        for word in text.replace(':', '').split():
+            self.words.append(word)
+            self.length += len(word) + 1
+
+    def text(self):
+        text = ' '.join(self.words)
+        return text[:self.max_length] + ('...' if len(text) > self.max_length else '')
+
+
+def html_preview(content, max_length=PREVIEW_LENGTH):
+    """Return a plain text preview of HTML content."""
+    preview = _PreviewText(max_length)
+    if not _MARKUP_CHARS_RE.search(content):
+        preview.add_text(content)
+        return preview.text()
+    for node in LexborHTMLParser(content).root.traverse(include_text=True):
+        if node.tag == '-text':
+            preview.add(node)
+    return preview.text()
+
 class Thread(models.Model):
     title = models.CharField(max_length=255)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_threads', null=True, blank=True)
@@ -110,6 +184,9 @@ class Audio(models.Model):
 
 class RichTextMessage(models.Model):
     content = models.TextField()
+    # Set by clean(); bulk_create() and QuerySet.update() skip it, so bulk
+    # writes of content must set preview too (an empty one is recomputed)
+    preview = models.CharField(max_length=200, blank=True, default='')
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
     thread = models.ForeignKey(Thread, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -123,47 +200,79 @@ class RichTextMessage(models.Model):
 
     def clean(self):
         """Validate and sanitize HTML content."""
-        soup = BeautifulSoup(self.content, 'html.parser')
-        
-        # Check for script tags
-        if soup.find('script'):
-            raise ValidationError('Script tags are not allowed')
-        
-        # Check for javascript: URLs in img and iframe tags
-        for img in soup.find_all('img'):
-            if not img.get('src'):
-                raise ValidationError('Image tags must have a src attribute')
-            if img['src'].lower().startswith('javascript:'):
-                raise ValidationError('JavaScript URLs are not allowed in image src')
-        
-        for iframe in soup.find_all('iframe'):
-            if not iframe.get('src'):
-                raise ValidationError('Iframe tags must have a src attribute')
-            if iframe['src'].lower().startswith('javascript:'):
-                raise ValidationError('JavaScript URLs are not allowed in iframe src')
-
-        # Remove disallowed attributes (style, class) from all tags
-        for tag in soup.find_all(True):
-            if 'style' in tag.attrs:
-                del tag['style']
-            if 'class' in tag.attrs:
-                del tag['class']
-
-        # Update content with sanitized HTML
-        self.content = str(soup)
+        self.content, self.preview = self._process_content(self.content)
         super().clean()
 
+    @staticmethod
+    def _process_content(html):
+        """Validate and sanitize html in a single tree walk.
+
+        Returns the sanitized HTML and its preview. Raises ValidationError
+        for script elements and for img/iframe tags with a missing or
+        javascript: src.
+
+        html is parsed as a document and the body is serialized, so the
+        stored content is normalized the way an HTML5 parser sees it:
+        head-only elements such as <style> and <title> are dropped, table
+        rows outside a table lose their tags, <tbody> is added to tables,
+        leading whitespace is removed, CR LF becomes LF and non-breaking
+        spaces are written as &nbsp;.
+        """
+        preview = _PreviewText(PREVIEW_LENGTH)
+        # Plain text has nothing to sanitize, so no tree is built for it
+        if not _MARKUP_CHARS_RE.search(html):
+            preview.add_text(html)
+            return html.lstrip(_HTML_LEADING_WHITESPACE), preview.text()
+
+        tree = LexborHTMLParser(html)
+        # Check for script tags; without a literal '<script' there is nothing to find
+        if SCRIPT_TAG_RE.search(html) and tree.css_first('script') is not None:
+            raise ValidationError('Script tags are not allowed')
+
+        body = tree.body
+        if body is None:  # A frameset document has no body to keep
+            return '', ''
+
+        src_errors = {}
+        # Head-only elements are not stored, so only the body is walked
+        for node in body.traverse(include_text=True):
+            tag = node.tag
+            if tag == '-text':
+                preview.add(node)
+                continue
+            if tag.startswith('-'):
+                continue
+
+            # Check for missing and javascript: URLs in img and iframe tags
+            if tag in _SRC_ERRORS and tag not in src_errors:
+                src = node.attributes.get('src')
+                if not src:
+                    src_errors[tag] = _SRC_ERRORS[tag][0]
+                elif src.lower().startswith('javascript:'):
+                    src_errors[tag] = _SRC_ERRORS[tag][1]
+
+            # Remove disallowed attributes (style, class)
+            for attr in DISALLOWED_ATTRS.intersection(node.attributes):
+                del node.attrs[attr]
+
+        # Image problems are reported ahead of iframe ones
+        for tag in ('img', 'iframe'):
+            if tag in src_errors:
+                raise ValidationError(src_errors[tag])
+
+        # The parser wraps fragments in <html><body>, so only the body's children are kept
+        return body.inner_html, preview.text()
+
     def save(self, *args, **kwargs):
         """Clean content before saving."""
         self.clean()
         super().save(*args, **kwargs)
 
-    def get_preview(self, max_length=100):
+    def get_preview(self, max_length=PREVIEW_LENGTH):
         """Get a plain text preview of the message content."""
-        soup = BeautifulSoup(self.content, 'html.parser')
-        # Remove colons and normalize whitespace
-        text = ' '.join(soup.get_text(separator=' ', strip=True).replace(':', '').split())
-        return text[:max_length] + ('...' if len(text) > max_length else '')
+        if max_length == PREVIEW_LENGTH and self.preview:
+            return self.preview
+        return html_preview(self.content, max_length)
 
 class EmailTemplate(models.Model):
     """Model for storing email templates"""
@@ -176,15 +285,11 @@ class EmailTemplate(models.Model):
 
     def render_subject(self, context):
         """Render email subject with context variables"""
-        from django.template import Template, Context
-        template = Template(self.subject)
-        return template.render(Context(context))
+        return _render_template(self.subject, context)
 
     def render_body(self, context):
         """Render email body with context variables"""
-        from django.template import Template, Context
-        template = Template(self.body)
-        return template.render(Context(context))
+        return _render_template(self.body, context)
 
     def __str__(self):
         return self.name
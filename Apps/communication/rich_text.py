@@ -1,249 +1,452 @@
 import re
-import html
+from functools import cached_property, lru_cache
 from typing import Optional, List, Tuple
+from urllib.parse import quote
 import logging
 
+try:
+    import hyperscan
+except ImportError:  # Optional; validation falls back to the re module
+    hyperscan = None
+
+try:
+    from numba import njit
+except ImportError:  # Optional; nesting checks fall back to pure Python
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Same output as html.escape(quote=True), in a single translate call
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+_NEEDS_ESCAPE = re.compile(r'[&<>"\']')
+
+
+# Fixed tag strings, built once rather than formatted for every element
+TAGS = {
+    'hr': '<hr>',
+    'ul_open': '<ul>',
+    'ul_close': '</ul>',
+    'ol_open': '<ol>',
+    'ol_close': '</ol>',
+    'blockquote_open': '<blockquote>',
+    'blockquote_close': '</blockquote>',
+    'table_open': '<table>\n<thead><tr>',
+    'thead_close': '</tr></thead>\n<tbody>',
+    'table_close': '</tbody>\n</table>',
+    'tr_open': '<tr>',
+    'tr_close': '</tr>',
+}
+H_OPEN = ('',) + tuple(f'<h{level}>' for level in range(1, 7))
+H_CLOSE = ('',) + tuple(f'</h{level}>' for level in range(1, 7))
+# Any of these in the output means it is not a bare paragraph
+BLOCK_TAGS = H_OPEN[1:] + ('<ul>', '<ol>', '<table>', '<blockquote>')
+
+
+# Media kind for each allowed file extension; .ogg is also accepted as audio
+_MEDIA_KIND = {
+    'jpg': 'image',
+    'jpeg': 'image',
+    'png': 'image',
+    'gif': 'image',
+    'webp': 'image',
+    'svg': 'image',
+    'mp4': 'video',
+    'webm': 'video',
+    'ogg': 'video',
+    'mp3': 'audio',
+    'wav': 'audio',
+    'm4a': 'audio',
+}
+
+
+def _media_extension(url: str) -> str:
+    """Return the lowercased file extension of url, ignoring any query string"""
+    path = url.split('?', 1)[0]
+    if '.' not in path:
+        return ''
+    return path.rsplit('.', 1)[-1].lower()
+
+
+# URL schemes links may use
+_SAFE_SCHEMES = frozenset({'http', 'https', 'mailto', 'tel'})
+_SCHEME_RE = re.compile(r'([A-Za-z][A-Za-z0-9+.\-]*):')
+
+# Reserved URL characters and '%' stay as written so URLs are not double-encoded
+_URL_SAFE_CHARS = ":/?#[]@!$&'()*+,;=%"
+
+
+@lru_cache(maxsize=1024)
+def _safe_quote(url: str) -> str:
+    """Percent-encode a media URL, memoized since messages reuse the same URLs"""
+    return quote(url, safe=_URL_SAFE_CHARS)
+
+
+def escape_html(text: str) -> str:
+    """Escape HTML special characters, skipping text that has none"""
+    if not _NEEDS_ESCAPE.search(text):
+        return text
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+def _scan_depths(buf: bytes) -> Tuple[int, int]:
+    """Return the deepest blockquote run and list-item indent in ASCII text"""
+    max_quote = 0
+    max_indent = 0
+    n = len(buf)
+    i = 0
+    while i < n:
+        # Leading whitespace is the list indent
+        start = i
+        while i < n and buf[i] != 10 and (9 <= buf[i] <= 13 or 28 <= buf[i] <= 32):
+            i += 1
+        indent = i - start
+
+        # A list item is '-', '*' or digits plus '.', then whitespace
+        j = i
+        if j < n and (buf[j] == 45 or buf[j] == 42):
+            is_item = True
+        else:
+            while j < n and 48 <= buf[j] <= 57:
+                j += 1
+            is_item = j > i and j < n and buf[j] == 46
+        j += 1
+        if is_item and j < n and buf[j] != 10 and (9 <= buf[j] <= 13 or 28 <= buf[j] <= 32):
+            max_indent = max(max_indent, indent)
+
+        # Count '>' markers, allowing whitespace between them
+        depth = 0
+        while i < n and buf[i] == 62:
+            depth += 1
+            i += 1
+            while i < n and buf[i] != 10 and (9 <= buf[i] <= 13 or 28 <= buf[i] <= 32):
+                i += 1
+        max_quote = max(max_quote, depth)
+
+        while i < n and buf[i] != 10:
+            i += 1
+        i += 1
+    return max_quote, max_indent
+
+
+if njit is not None:
+    _scan_depths = njit(cache=True)(_scan_depths)
+
+
+class _ReMatcher:
+    """Finds the first match of any pattern with a single re alternation"""
+
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.regex = re.compile('|'.join(patterns), re.IGNORECASE)
+
+    def search(self, content: str) -> Optional[str]:
+        match = self.regex.search(content)
+        return match.group(0) if match else None
+
+
+class _HyperscanMatcher:
+    """Scans for all patterns at once with a Hyperscan database"""
+
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.patterns = patterns
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        self.database = hyperscan.Database()
+        self.database.compile(
+            expressions=[pattern.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns),
+        )
+
+    def search(self, content: str) -> Optional[str]:
+        hits = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            hits.append(pattern_id)
+            return True  # Stop scanning at the first hit
+
+        try:
+            self.database.scan(content.encode('utf-8', 'replace'), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        return self.patterns[hits[0]] if hits else None
+
+
+def _pattern_matcher(patterns: Tuple[str, ...]):
+    """Build a matcher for patterns on the fastest available backend"""
+    if hyperscan is not None:
+        return _HyperscanMatcher(patterns)
+    return _ReMatcher(patterns)
+
+
 class RichTextFormatter:
     """Handles formatting of rich text content"""
     
-    def __init__(self):
-        self.formatting_rules = {
-            # Basic formatting
-            r'\*\*(.*?)\*\*': r'<strong>\1</strong>',  # Bold
-            r'\*(.*?)\*': r'<em>\1</em>',              # Italic
-            r'`(.*?)`': r'<code>\1</code>',            # Code
-            
-            # Headers
-            r'^# (.*?)$': r'<h1>\1</h1>',              # H1
-            r'^## (.*?)$': r'<h2>\1</h2>',             # H2
-            r'^### (.*?)$': r'<h3>\1</h3>',            # H3
-            
-            # Horizontal rules
-            r'^---$': r'<hr>',                         # Horizontal rule
-        }
-        
-        # Multi-line patterns that need special handling
-        self.multiline_patterns = {
-            'media': self._format_media,  # Media must be first to prevent link formatting from interfering
-            'links': self._format_links,
-            'lists': self._format_lists,
-            'tables': self._format_tables,
-            'blockquotes': self._format_blockquotes,
-        }
+    # Patterns are compiled once at import time and shared by every instance
+    ORDERED_ITEM_RE = re.compile(r'^\s*\d+\.\s+')
+    LINK_RE = re.compile(r'\[(.*?)\]\((.*?)(?:\s+"([^"]*)")?\)')
+    HEADER_LINE_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+    HR_LINE_RE = re.compile(r'---+')
+    # One scan finds media, links and code; the outer group names the handler
+    INLINE_RE = re.compile(
+        r'(?P<media>!\[(?P<media_alt>.*?)\]\((?P<media_url>.*?)(?:\{(?P<media_type>[^}]*)\})?\))'
+        r'|(?P<link>\[(?P<link_text>.*?)\]\((?P<link_url>.*?)(?:\s+"(?P<link_title>[^"]*)")?\))'
+        r'|(?P<code>`(?P<code_text>.+?)`)'
+    )
+    # Bold then italic pair markers across the whole text, as separate passes,
+    # so runs such as ***x*** leave no stray markers
+    BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+    ITALIC_RE = re.compile(r'\*(.+?)\*')
+    TAG_SPLIT_RE = re.compile(r'(<[^>]*>)')
+    # Content with none of these renders as one escaped paragraph
+    MARKUP_RE = re.compile(r'[*`\[#>|<\-]|^\s*\d+\.\s', re.MULTILINE)
+    # Content with none of these is a single paragraph of inline elements
+    BLOCK_MARKUP_RE = re.compile(r'[\n|<]|^\s*(?:[#>-]|\d+\.\s)')
     
-    def _format_lists(self, content: str) -> str:
-        """Format lists (both ordered and unordered)"""
-        lines = content.split('\n')
-        in_list = False
-        list_type = None
-        result = []
-        
-        for line in lines:
-            # Check for unordered list items
-            if line.strip().startswith('- '):
-                if not in_list or list_type != 'ul':
-                    if in_list:
-                        result.append(f'</{list_type}>')
-                    result.append('<ul>')
-                    in_list = True
-                    list_type = 'ul'
-                result.append(f'<li>{line.strip()[2:]}</li>')
-            # Check for ordered list items
-            elif re.match(r'^\s*\d+\.\s+', line):
-                if not in_list or list_type != 'ol':
-                    if in_list:
-                        result.append(f'</{list_type}>')
-                    result.append('<ol>')
-                    in_list = True
-                    list_type = 'ol'
-                result.append(f'<li>{re.sub(r"^\s*\d+\.\s+", "", line)}</li>')
-            else:
-                if in_list:
-                    result.append(f'</{list_type}>')
-                    in_list = False
-                result.append(line)
-        
-        if in_list:
-            result.append(f'</{list_type}>')
-        
-        return '\n'.join(result)
-    
-    def _format_tables(self, content: str) -> str:
-        """Format tables"""
-        lines = content.split('\n')
-        in_table = False
-        result = []
-        header_row = None
-        
-        for line in lines:
-            if '|' in line:
-                cells = [cell.strip() for cell in line.strip('|').split('|')]
-                if not in_table:
-                    in_table = True
-                    header_row = cells
-                    result.append('<table>\n<thead><tr>')
-                    result.extend([f'<th>{cell}</th>' for cell in cells])
-                    result.append('</tr></thead>\n<tbody>')
-                elif all('-' in cell for cell in cells):
-                    continue
-                else:
-                    result.append('<tr>')
-                    result.extend([f'<td>{cell}</td>' for cell in cells])
-                    result.append('</tr>')
-            else:
-                if in_table:
-                    result.append('</tbody>\n</table>')
-                    in_table = False
-                result.append(line)
-        
-        if in_table:
-            result.append('</tbody>\n</table>')
-        
-        return '\n'.join(result)
+    # Validation patterns
+    XSS_PATTERNS = (
+        r'<script.*?>.*?</script>',
+        r'javascript:',
+        r'on\w+=',
+        r'data:',
+        r'vbscript:',
+        r'<iframe.*?>',
+        r'<object.*?>',
+        r'<embed.*?>',
+    )
+    XSS_MATCHER = _pattern_matcher(XSS_PATTERNS)
+    # Every XSS pattern needs at least one of these characters to match
+    XSS_TRIGGER_CHARS = ('<', ':', '=')
+    # Content without any of these characters cannot fail a validation rule
+    VALIDATION_CHARS_RE = re.compile(r'[*_`\[\]()<>:=-]|\d\.')
+    MEDIA_VALIDATION_RE = re.compile(r'!\[(.*?)\]\((.*?)\)(?:\{(.*?)\})?')
+    LIST_ITEM_RE = re.compile(r'^(\s*)(?:[-*]|\d+\.)\s')
+    INVALID_NESTING_RES = tuple(re.compile(pattern) for pattern in (
+        r'`[^`]*\*\*[^`]*`',  # Bold inside code
+        r'`[^`]*\*[^`]*`',     # Italic inside code
+        r'`[^`]*_[^`]*`',       # Underscore inside code
+    ))
+    ORDERED_START_RE = re.compile(r'^\d+\.')
+    INDENTED_LIST_RE = re.compile(r'^\s*[-*]')
+    INDENTED_ORDERED_RE = re.compile(r'^\s*\d+\.')
+    INLINE_ELEMENT_RES = tuple(re.compile(pattern) for pattern in (
+        r'.*!\[.*?\]\(.*?(?:\{[^}]*\})?\).*',  # Images with optional type
+        r'.*\[.*?\]\(.*?\).*',                  # Links
+        r'.*\*\*.*\*\*.*',                        # Bold
+        r'.*\*[^*]+\*.*',                         # Italic
+        r'.*`[^`]+`.*',                           # Code
+    ))
+    ORDERED_ITEM_START_RE = re.compile(r'^\s*\d+\.\s')
+    QUOTE_PREFIX_RE = re.compile(r'[\s>]*')
     
-    def _format_blockquotes(self, content: str) -> str:
-        """Format multi-line blockquotes"""
-        lines = content.split('\n')
+    def _format_header_line(self, line: str) -> str:
+        match = self.HEADER_LINE_RE.match(line)
+        if match:
+            level = len(match.group(1))
+            return H_OPEN[level] + match.group(2) + H_CLOSE[level]
+        return line
+
+    def _format_rule_line(self, line: str) -> str:
+        return TAGS['hr'] if self.HR_LINE_RE.fullmatch(line) else line
+
+    def _emit_table(self, header: List[str], columns: List[List[Optional[str]]], row_count: int,
+                    out: List[str]) -> None:
+        """Append a buffered table; columns hold one cell per row, None where a row is short"""
+        out.append(TAGS['table_open'])
+        out.extend([f'<th>{cell}</th>' for cell in header])
+        out.append(TAGS['thead_close'])
+        for row in range(row_count):
+            out.append(TAGS['tr_open'])
+            out.extend([f'<td>{column[row]}</td>' for column in columns if column[row] is not None])
+            out.append(TAGS['tr_close'])
+        out.append(TAGS['table_close'])
+
+    def _format_blocks(self, content: str, out: List[str]) -> None:
+        """Append block-level lines for content to out in a single pass"""
         in_blockquote = False
-        result = []
-        
-        for line in lines:
+        list_close = None  # Closing tag of the open list, if any
+
+        # Table body cells are buffered per column until the table ends
+        table_header = None
+        table_columns: List[List[Optional[str]]] = []
+        table_rows = 0
+
+        def close_table():
+            nonlocal table_header, table_columns, table_rows
+            if table_header is not None:
+                self._emit_table(table_header, table_columns, table_rows, out)
+                table_header = None
+                table_columns = []
+                table_rows = 0
+
+        def close_list():
+            nonlocal list_close
+            if list_close:
+                out.append(list_close)
+                list_close = None
+
+        for line in content.split('\n'):
+            # Blockquotes wrap whatever the rest of the line turns into
             if line.startswith('> '):
                 if not in_blockquote:
-                    result.append('<blockquote>')
+                    close_table()
+                    close_list()
+                    out.append(TAGS['blockquote_open'])
                     in_blockquote = True
-                result.append(line[2:])
+                line = line[2:]
+            elif in_blockquote:
+                close_table()
+                close_list()
+                out.append(TAGS['blockquote_close'])
+                in_blockquote = False
+
+            # Headers and horizontal rules are chosen by the first character
+            handler = self.LINE_DISPATCH.get(line[:1])
+            if handler:
+                line = handler(self, line)
+
+            if '|' in line:
+                cells = [cell.strip() for cell in line.strip('|').split('|')]
+                if table_header is None:
+                    close_list()
+                    table_header = cells
+                elif not all('-' in cell for cell in cells):
+                    if len(cells) > len(table_columns):
+                        table_columns.extend(
+                            [None] * table_rows for _ in range(len(cells) - len(table_columns))
+                        )
+                    for index, column in enumerate(table_columns):
+                        column.append(cells[index] if index < len(cells) else None)
+                    table_rows += 1
+                continue
+
+            close_table()
+
+            stripped = line.strip()
+            if stripped.startswith('- '):
+                item_open, item_close, item = TAGS['ul_open'], TAGS['ul_close'], stripped[2:]
             else:
-                if in_blockquote:
-                    result.append('</blockquote>')
-                    in_blockquote = False
-                result.append(line)
-        
+                match = self.ORDERED_ITEM_RE.match(line)
+                if not match:
+                    close_list()
+                    out.append(line)
+                    continue
+                item_open, item_close, item = TAGS['ol_open'], TAGS['ol_close'], line[match.end():]
+
+            if list_close != item_close:
+                close_list()
+                out.append(item_open)
+                list_close = item_close
+            out.append(f'<li>{item}</li>')
+
+        close_table()
+        close_list()
         if in_blockquote:
-            result.append('</blockquote>')
-        
-        return '\n'.join(result)
+            out.append(TAGS['blockquote_close'])
     
-    def _format_links(self, content):
-        def replace_link(match):
-            text = match.group(1)
-            url = match.group(2)
-            title = match.group(3) if len(match.groups()) > 2 and match.group(3) else None
-            
-            # Clean up the URL and title
-            url = url.strip()
-            if title:
-                title = title.strip()
-                return f'<a href="{url}" title="{title}">{text}</a>'
-            return f'<a href="{url}">{text}</a>'
-        
-        # Handle both types of links with a single pattern
-        pattern = r'\[(.*?)\]\((.*?)(?:\s+"([^"]*)")?\)'
-        return re.sub(pattern, replace_link, content)
-    
-    def _format_media(self, content: str) -> str:
+    def _format_inline(self, content: str) -> str:
+        """Format media, links and code in a single scan, then bold and italic"""
+        formatted = self._format_spans(content)
+        formatted = self.BOLD_RE.sub(r'<strong>\1</strong>', formatted)
+        return self.ITALIC_RE.sub(r'<em>\1</em>', formatted)
+
+    def _format_spans(self, content: str) -> str:
+        """Format media, links and code, leaving emphasis markers in place"""
+        return self.INLINE_RE.sub(self._replace_inline, content)
+
+    def _replace_inline(self, match) -> str:
+        return self.INLINE_DISPATCH[match.lastgroup](self, match)
+
+    def _format_link(self, match) -> str:
+        text = self._format_spans(match.group('link_text'))
+        # Clean up the URL and title
+        url = match.group('link_url').strip()
+        title = match.group('link_title')
+        if title:
+            title = title.strip()
+            return f'<a href="{url}" title="{title}">{text}</a>'
+        return f'<a href="{url}">{text}</a>'
+
+    def _format_media(self, match) -> str:
         """Format media (images, videos, audio, etc.)"""
-        def replace_media(match):
-            alt_text = match.group(1)
-            url = match.group(2)
-            media_type = match.group(3) if len(match.groups()) > 2 else None
-            
-            # Clean up the URL and alt text
-            url = url.strip()
-            alt_text = alt_text.strip()
-            
-            # URL encode spaces in the URL
-            url = url.replace(' ', '%20')
-            
-            # Escape special characters in alt text
-            alt_text = html.escape(alt_text, quote=True)
-            
-            # Determine media type from URL extension if not specified
-            if not media_type:
-                ext = url.lower().split('.')[-1]
-                if ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-                    media_type = 'image'
-                elif ext in ['mp4', 'webm', 'ogg']:
-                    media_type = 'video'
-                elif ext in ['mp3', 'wav', 'ogg']:
-                    media_type = 'audio'
-                else:
-                    media_type = 'image'  # Default to image if unknown
-            
-            # Format based on media type
-            if media_type == 'image':
-                return f'<img src="{url}" alt="{alt_text}" class="rich-text-media">'
-            elif media_type == 'video':
-                return f'<video src="{url}" controls class="rich-text-media"><p>{alt_text}</p></video>'
-            elif media_type == 'audio':
-                return f'<audio src="{url}" controls class="rich-text-media"><p>{alt_text}</p></audio>'
-            else:
-                return f'<img src="{url}" alt="{alt_text}" class="rich-text-media">'
-        
-        # Pattern for media with optional type specification: ![alt](url) or ![alt](url){type}
-        pattern = r'!\[(.*?)\]\((.*?)(?:\{([^}]*)\})?\)'
-        return re.sub(pattern, replace_media, content)
-    
-    def _format_headers(self, content):
-        for i in range(6, 0, -1):
-            pattern = r'^#{' + str(i) + r'}\s+(.+)$'
-            content = re.sub(pattern, rf'<h{i}>\1</h{i}>', content, flags=re.MULTILINE)
-        return content
+        media_type = match.group('media_type')
+
+        # Clean up the URL and alt text
+        url = match.group('media_url').strip()
+        alt_text = match.group('media_alt').strip()
+
+        # Percent-encode spaces and other characters unsafe in a URL
+        url = _safe_quote(url)
+
+        # Escape special characters in alt text
+        alt_text = escape_html(alt_text)
 
-    def _format_horizontal_rules(self, content):
-        return re.sub(r'^---+$', '<hr>', content, flags=re.MULTILINE)
+        # Determine media type from URL extension if not specified
+        if not media_type:
+            media_type = _MEDIA_KIND.get(_media_extension(url), 'image')  # Default to image if unknown
 
-    def _format_bold(self, content):
-        return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', content)
+        # Format based on media type
+        if media_type == 'image':
+            return f'<img src="{url}" alt="{alt_text}" class="rich-text-media">'
+        elif media_type == 'video':
+            return f'<video src="{url}" controls class="rich-text-media"><p>{alt_text}</p></video>'
+        elif media_type == 'audio':
+            return f'<audio src="{url}" controls class="rich-text-media"><p>{alt_text}</p></audio>'
+        else:
+            return f'<img src="{url}" alt="{alt_text}" class="rich-text-media">'
 
-    def _format_italic(self, content):
-        return re.sub(r'\*(.+?)\*', r'<em>\1</em>', content)
+    def _format_code(self, match) -> str:
+        return f'<code>{self._format_spans(match.group("code_text"))}</code>'
 
-    def _format_code(self, content):
-        return re.sub(r'`(.+?)`', r'<code>\1</code>', content)
+    INLINE_DISPATCH = {
+        'media': _format_media,
+        'link': _format_link,
+        'code': _format_code,
+    }
     
     def _escape_text_preserve_tags(self, content: str) -> str:
         """Escape text content while preserving HTML tags"""
-        # Split content into text and HTML tags
-        parts = re.split(r'(<[^>]*>)', content)
-        escaped_parts = []
-        
-        for part in parts:
-            if part.startswith('<') and part.endswith('>'):
-                # This is an HTML tag, preserve it
-                escaped_parts.append(part)
-            else:
-                # This is text content, escape it
-                escaped_parts.append(html.escape(part, quote=True))
-        
-        return ''.join(escaped_parts)
+        # The capturing split alternates text and tags, so text sits at the
+        # even indexes and can be escaped in place in the same buffer
+        parts = self.TAG_SPLIT_RE.split(content)
+        parts[::2] = [escape_html(part) for part in parts[::2]]
+        return ''.join(parts)
     
+    LINE_DISPATCH = {
+        '#': _format_header_line,
+        '-': _format_rule_line,
+    }
+
     def format(self, content: str) -> str:
         """Format the content according to rich text rules"""
         if not content:
             return ""
-            
-        # Format block-level elements first
-        formatted = content
-        formatted = self._format_blockquotes(formatted)
-        
-        # Format media and links
-        formatted = self._format_media(formatted)
-        formatted = self._format_links(formatted)
+
+        if not self.MARKUP_RE.search(content):
+            return f"<p>{escape_html(content)}</p>"
         
-        # Format inline elements
-        formatted = self._format_bold(formatted)
-        formatted = self._format_italic(formatted)
-        formatted = self._format_code(formatted)
-        formatted = self._format_headers(formatted)
-        formatted = self._format_horizontal_rules(formatted)
-        formatted = self._format_tables(formatted)
-        formatted = self._format_lists(formatted)
+        return _format_cached(content)
+    
+    def _render(self, content: str) -> str:
+        """Run the full formatting pipeline over non-empty content"""
+        if not self.BLOCK_MARKUP_RE.search(content):
+            # One line of inline markup needs no block walk or wrap check
+            return f"<p>{self._escape_text_preserve_tags(self._format_inline(content))}</p>"
+
+        # Inline elements never span lines, so they are applied up front
+        formatted = self._format_inline(content)
+
+        # Block-level elements are then built in one walk over the lines
+        out: List[str] = []
+        self._format_blocks(formatted, out)
+        formatted = '\n'.join(out)
         
         # Wrap in paragraph if not already wrapped in a block element
-        if not any(tag in formatted for tag in ['<h1>', '<h2>', '<h3>', '<h4>', '<h5>', '<h6>', '<ul>', '<ol>', '<table>', '<blockquote>']):
+        if not any(tag in formatted for tag in BLOCK_TAGS):
             formatted = f"<p>{formatted}</p>"
         
         # Escape text content while preserving HTML tags
@@ -251,158 +454,132 @@ class RichTextFormatter:
         
         return formatted
     
+    def _nesting_depths(self, content: str) -> Tuple[int, int]:
+        """Return the deepest blockquote and list-item indent in content"""
+        if content.isascii():
+            return _scan_depths(content.encode('ascii'))
+
+        # Unicode whitespace counts too, so non-ASCII text is scanned as str
+        max_quote = 0
+        max_indent = 0
+        for line in content.split('\n'):
+            match = self.LIST_ITEM_RE.match(line)
+            if match:
+                max_indent = max(max_indent, len(match.group(1)))
+            # Quote depth is the number of '>' in the leading run of markers and whitespace
+            quote_count = self.QUOTE_PREFIX_RE.match(line).group().count('>')
+            max_quote = max(max_quote, quote_count)
+        return max_quote, max_indent
+
     def validate(self, content: str) -> bool:
         """Validate the content for security and formatting"""
         if content is None:
             return False
             
         logger.debug(f"Validating content: {content}")
+
+        # Validate content length
+        if len(content) > 10000:  # Maximum content length
+            logger.debug("Content too long")
+            return False
+
+        if not self.VALIDATION_CHARS_RE.search(content):
+            logger.debug("No markup characters, content validation passed")
+            return True
             
+        # Count each marker once; the counts serve both the pairing and the
+        # nesting checks, which run before any of the regex scans
+        marker_counts = {char: content.count(char) for char in ('*', '_', '`')}
+
         # Check for matching markdown syntax
         if content.count('**') % 2 != 0:
             logger.debug("Unmatched bold markers")
             return False
             
-        if content.count('*') % 2 != 0:
+        if marker_counts['*'] % 2 != 0:
             logger.debug("Unmatched italic markers")
             return False
             
-        if content.count('`') % 2 != 0:
+        if marker_counts['`'] % 2 != 0:
             logger.debug("Unmatched code markers")
             return False
+
+        # Validate nested formatting depth
+        max_nesting = 3
+        for char, count in marker_counts.items():
+            if count > max_nesting * 2:
+                logger.debug(f"Too many {char} characters")
+                return False
             
         # Check for potential XSS attacks
-        xss_patterns = [
-            r'<script.*?>.*?</script>',
-            r'javascript:',
-            r'on\w+=',
-            r'data:',
-            r'vbscript:',
-            r'<iframe.*?>',
-            r'<object.*?>',
-            r'<embed.*?>'
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                logger.debug(f"XSS pattern detected: {pattern}")
-                return False
-
-        # Define allowed extensions for each media type
-        allowed_extensions = {
-            'image': ['jpg', 'jpeg', 'png', 'gif', 'webp', 'svg'],
-            'video': ['mp4', 'webm', 'ogg'],
-            'audio': ['mp3', 'wav', 'ogg', 'm4a']
-        }
+        # str.__contains__ is a vectorised memchr, far cheaper than a regex scan
+        detected = (
+            any(char in content for char in self.XSS_TRIGGER_CHARS)
+            and self.XSS_MATCHER.search(content)
+        )
+        if detected:
+            logger.debug(f"XSS pattern detected: {detected}")
+            return False
 
         # Validate media file types
-        media_pattern = r'!\[(.*?)\]\((.*?)\)(?:\{(.*?)\})?'
-        for match in re.finditer(media_pattern, content):
+        for match in self.MEDIA_VALIDATION_RE.finditer(content):
             url = match.group(2).strip()
             media_type = match.group(3).strip() if match.group(3) else None
             
             logger.debug(f"Found media: url={url}, type={media_type}")
             
-            # Get file extension, handling query parameters
-            url_parts = url.split('?')[0].lower()  # Remove query parameters
-            if '.' not in url_parts:
+            ext = _media_extension(url)
+            if not ext:
                 logger.debug("URL has no extension")
                 continue  # Skip validation for URLs without extensions
-            ext = url_parts.split('.')[-1]
             
             logger.debug(f"File extension: {ext}")
             
-            # Special handling for .ogg files which can be both audio and video
-            if ext == 'ogg':
-                if media_type and media_type in ['audio', 'video']:
-                    continue  # Both audio and video are valid for .ogg
-                elif not media_type:
-                    # If no type specified, default to audio (or could be video)
-                    continue
-            
-            # Determine the expected media type based on extension
-            expected_type = None
-            for type_name, extensions in allowed_extensions.items():
-                if ext in extensions:
-                    expected_type = type_name
-                    break
+            # .ogg files can be both audio and video
+            if ext == 'ogg' and media_type in (None, '', 'audio', 'video'):
+                continue
             
-            # If media type is specified, validate against that type
+            kind = _MEDIA_KIND.get(ext)
             if media_type:
-                if media_type not in allowed_extensions:
-                    logger.debug(f"Invalid media type: {media_type}")
-                    return False
-                if ext not in allowed_extensions[media_type]:
-                    logger.debug(f"Extension {ext} not allowed for type {media_type}")
-                    return False
-                # Skip media type matching for .ogg files
-                if ext != 'ogg':
-                    if expected_type and media_type != expected_type:
-                        logger.debug(f"Media type {media_type} does not match extension type {expected_type}")
-                        return False
-            # If no media type specified, validate extension against allowed types
-            else:
-                if not expected_type:
-                    logger.debug(f"Extension {ext} not allowed for any media type")
+                if media_type != kind:
+                    logger.debug(f"Media type {media_type} does not match extension {ext}")
                     return False
+            elif not kind:
+                logger.debug(f"Extension {ext} not allowed for any media type")
+                return False
 
         # Validate URL schemes
-        url_pattern = r'\[(.*?)\]\((.*?)(?:\s+"([^"]*)")?\)'
-        for match in re.finditer(url_pattern, content):
+        for match in self.LINK_RE.finditer(content):
+            # Skip URL scheme validation for media files
+            start = match.start()
+            if start and content[start - 1] == '!':
+                continue
+
             url = match.group(2).strip()
             base_url = url.split('?')[0]  # Remove query parameters for scheme check
-            
-            # Skip URL scheme validation for media files
-            is_media = bool(re.search(r'!\[.*?\]\(' + re.escape(url) + r'\)', content))
-            if not is_media and not base_url.startswith(('http://', 'https://', 'mailto:', 'tel:')):
+            scheme_match = _SCHEME_RE.match(base_url)
+            # Scheme-less URLs stay invalid: an entity such as &#58; would let a
+            # browser decode them into javascript: inside the href
+            scheme = scheme_match.group(1).lower() if scheme_match else ''
+            if scheme not in _SAFE_SCHEMES:
                 logger.debug(f"Invalid URL scheme: {base_url}")
                 return False
 
-        # Validate content length
-        if len(content) > 10000:  # Maximum content length
-            logger.debug("Content too long")
-            return False
-
-        # Validate nested formatting depth
-        max_nesting = 3
-        for char in ['*', '_', '`']:
-            if content.count(char) > max_nesting * 2:
-                logger.debug(f"Too many {char} characters")
-                return False
-
-        # Validate blockquote nesting
+        # Validate blockquote and list nesting
         max_blockquote_depth = 5
-        for line in content.split('\n'):
-            line = line.lstrip()
-            quote_count = 0
-            while line.startswith('>'):
-                quote_count += 1
-                line = line[1:].lstrip()
-            if quote_count > max_blockquote_depth:
-                logger.debug(f"Blockquote nesting too deep: {quote_count}")
-                return False
-
-        # Validate list nesting
-        list_pattern = r'^(\s*)(?:[-*]|\d+\.)\s'
         max_list_depth = 3
-        for line in content.split('\n'):
-            match = re.match(list_pattern, line)
-            if match:
-                indent = len(match.group(1))
-                if indent // 2 > max_list_depth - 1:  # Adjust for zero-based counting
-                    logger.debug(f"List nesting too deep: {indent}")
-                    return False
+        quote_depth, list_indent = self._nesting_depths(content)
+        if quote_depth > max_blockquote_depth:
+            logger.debug(f"Blockquote nesting too deep: {quote_depth}")
+            return False
+        if list_indent // 2 > max_list_depth - 1:  # Adjust for zero-based counting
+            logger.debug(f"List nesting too deep: {list_indent}")
+            return False
 
         # Validate nested formatting combinations
-        invalid_patterns = [
-            r'`[^`]*\*\*[^`]*`',  # Bold inside code
-            r'`[^`]*\*[^`]*`',     # Italic inside code
-            r'`[^`]*_[^`]*`'       # Underscore inside code
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, content):
-                logger.debug(f"Invalid formatting pattern: {pattern}")
+        for pattern in self.INVALID_NESTING_RES:
+            if pattern.search(content):
+                logger.debug(f"Invalid formatting pattern: {pattern.pattern}")
                 return False
 
         # Special handling for mixed content
@@ -422,22 +599,18 @@ class RichTextFormatter:
                 line.startswith('-') or   # Unordered lists
                 line.startswith('*') or   # Unordered lists or emphasis
                 line.startswith('|') or   # Tables
-                re.match(r'^\d+\.', line) or  # Ordered lists
-                re.match(r'^\s*[-*]', line) or  # Indented lists
-                re.match(r'^\s*\d+\.', line)):  # Indented ordered lists
+                self.ORDERED_START_RE.match(line) or  # Ordered lists
+                self.INDENTED_LIST_RE.match(line) or  # Indented lists
+                self.INDENTED_ORDERED_RE.match(line)):  # Indented ordered lists
                 logger.debug(f"Line {i} starts a block element")
                 in_block = True
                 continue
                 
             # Check for inline elements
-            if (re.match(r'.*!\[.*?\]\(.*?(?:\{[^}]*\})?\).*', line) or  # Images with optional type
-                re.match(r'.*\[.*?\]\(.*?\).*', line) or  # Links
-                re.match(r'.*\*\*.*\*\*.*', line) or  # Bold
-                re.match(r'.*\*[^*]+\*.*', line) or  # Italic
-                re.match(r'.*`[^`]+`.*', line) or  # Code
+            if (any(pattern.match(line) for pattern in self.INLINE_ELEMENT_RES) or
                 line.strip().startswith('> ') or  # Blockquote
                 line.strip().startswith('- ') or  # List item
-                re.match(r'^\s*\d+\.\s', line) or  # Ordered list item
+                self.ORDERED_ITEM_START_RE.match(line) or  # Ordered list item
                 line.strip() == '' or  # Empty line
                 line.strip().isspace()):  # Whitespace-only line
                 logger.debug(f"Line {i} contains valid inline elements")
@@ -452,30 +625,53 @@ class RichTextFormatter:
         logger.debug("Content validation passed")
         return True
 
+
+_formatter = RichTextFormatter()
+_TAG_RE = re.compile(r'<[^>]+>')
+PREVIEW_LENGTH = 100
+
+
+@lru_cache(maxsize=4096)
+def _format_cached(content: str) -> str:
+    """Format content with the shared formatter, memoized on the raw text"""
+    return _formatter._render(content)
+
+
 class RichTextMessage:
     """Represents a rich text message with formatting and validation"""
     
     def __init__(self, content: str):
         self.raw_content = content
         self.formatter = RichTextFormatter()
-        self._formatted_content = None
     
-    @property
+    @cached_property
     def formatted_content(self) -> str:
-        """Get the formatted content, formatting if necessary"""
-        if self._formatted_content is None:
-            if not self.formatter.validate(self.raw_content):
-                raise ValueError("Invalid content detected")
-            self._formatted_content = self.formatter.format(self.raw_content)
-        return self._formatted_content
+        """Get the formatted content, formatting on first access"""
+        if not self.formatter.validate(self.raw_content):
+            raise ValueError("Invalid content detected")
+        return self.formatter.format(self.raw_content)
     
-    def generate_preview(self, max_length: int = 100) -> str:
+    @cached_property
+    def plain_text(self) -> str:
+        """Get the formatted content with all tags removed"""
+        return _TAG_RE.sub('', self.formatted_content)
+
+    @cached_property
+    def preview(self) -> str:
+        """Get the default-length preview, generating it on first access"""
+        return self._truncate(PREVIEW_LENGTH)
+
+    def generate_preview(self, max_length: int = PREVIEW_LENGTH) -> str:
         """Generate a preview of the message"""
-        # Remove formatting for preview
-        preview = re.sub(r'<[^>]+>', '', self.formatted_content)
+        if max_length == PREVIEW_LENGTH:
+            return self.preview
+        return self._truncate(max_length)
+
+    def _truncate(self, max_length: int) -> str:
+        preview = self.plain_text
         
         # Truncate if necessary
         if len(preview) > max_length:
             preview = preview[:max_length] + "..."
             
-        return preview 
\ No newline at end of file
+        return preview
@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from .models import RichTextMessage
-from bs4 import BeautifulSoup
+from .models import RichTextMessage, SCRIPT_TAG_RE, DISALLOWED_ATTRS
+from selectolax.lexbor import LexborHTMLParser
 from django.core.exceptions import ValidationError
 from Apps.communication.models import EmailTemplate, EmailTracking, EmailAnalytics
 
@@ -11,39 +11,43 @@ class RichTextMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['sender', 'created_at', 'updated_at']
 
     def validate_content(self, value):
-        soup = BeautifulSoup(value, 'html.parser')
-        
-        # Check for script tags
-        if soup.find('script'):
+        # DRF has already decoded the body, so value is str; Lexbor never
+        # sniffs encodings (bytes would be read as UTF-8)
+        tree = LexborHTMLParser(value)
+
+        # Check for script tags; without a literal '<script' there is nothing to find
+        if SCRIPT_TAG_RE.search(value) and tree.css_first('script') is not None:
             raise serializers.ValidationError('Script tags are not allowed')
         
         # Check for event handlers on any tag
-        for tag in soup.find_all(True):
-            for attr in tag.attrs:
+        for node in tree.css('*'):
+            for attr in node.attributes:
                 if attr.startswith('on'):
                     raise serializers.ValidationError('Event handlers are not allowed in HTML content')
         
         # Check for javascript: URLs in img and iframe tags
-        for img in soup.find_all('img'):
-            if not img.get('src'):
+        for img in tree.css('img'):
+            src = img.attributes.get('src')
+            if not src:
                 raise serializers.ValidationError('Image tags must have a src attribute')
-            if img['src'].lower().startswith('javascript:'):
+            if src.lower().startswith('javascript:'):
                 raise serializers.ValidationError('JavaScript URLs are not allowed in image src')
         
-        for iframe in soup.find_all('iframe'):
-            if not iframe.get('src'):
+        for iframe in tree.css('iframe'):
+            src = iframe.attributes.get('src')
+            if not src:
                 raise serializers.ValidationError('Iframe tags must have a src attribute')
-            if iframe['src'].lower().startswith('javascript:'):
+            if src.lower().startswith('javascript:'):
                 raise serializers.ValidationError('JavaScript URLs are not allowed in iframe src')
         
         # Remove disallowed attributes (style, class) from all tags
-        for tag in soup.find_all(True):
-            if 'style' in tag.attrs:
-                del tag['style']
-            if 'class' in tag.attrs:
-                del tag['class']
+        for node in tree.css('[style], [class]'):
+            for attr in DISALLOWED_ATTRS.intersection(node.attributes):
+                del node.attrs[attr]
 
-        return str(soup)
+        # The parser wraps fragments in <html><body>; return only the body's
+        # children, normalized as described in RichTextMessage._process_content
+        return tree.body.inner_html if tree.body else ''
 
     def create(self, validated_data):
         # Ensure sender is set from the request user
@@ -1,5 +1,6 @@
 import os
 import logging
+import tempfile
 from typing import Optional, Tuple
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.conf import settings
@@ -22,6 +23,27 @@ class AudioProcessingService:
         self.max_file_size = 10 * 1024 * 1024  # 10MB
         self.sample_rate = 44100  # Standard sample rate
     
+    def _write_temp_file(self, audio_file) -> str:
+        """
+        Write an uploaded file to a uniquely named file under MEDIA_ROOT/temp.
+        
+        Args:
+            audio_file: The uploaded audio file
+            
+        Returns:
+            Path of the temporary file
+        """
+        temp_dir = os.path.join(settings.MEDIA_ROOT, 'temp')
+        os.makedirs(temp_dir, exist_ok=True)
+        
+        # mkstemp avoids collisions between concurrent uploads sharing a name
+        suffix = os.path.splitext(audio_file.name)[1]
+        fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=temp_dir)
+        with os.fdopen(fd, 'wb') as destination:
+            for chunk in audio_file.chunks():
+                destination.write(chunk)
+        return temp_path
+    
     def validate_audio_file(self, audio_file: InMemoryUploadedFile) -> Tuple[bool, str]:
         """
         Validate the audio file format and size.
@@ -61,16 +83,21 @@ class AudioProcessingService:
                 logger.error(f"Audio validation failed: {error_message}")
                 return None
                 
-            # Save the file temporarily
-            temp_path = os.path.join(settings.MEDIA_ROOT, 'temp', audio_file.name)
-            os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-            
-            with open(temp_path, 'wb+') as destination:
-                for chunk in audio_file.chunks():
-                    destination.write(chunk)
-            
-            # Load and process the audio file
-            audio_data, sample_rate = librosa.load(temp_path, sr=self.sample_rate)
+            # Uploads Django already spooled to disk are read in place; only
+            # in-memory uploads need a temporary copy
+            if hasattr(audio_file, 'temporary_file_path'):
+                file_path = audio_file.temporary_file_path()
+                temp_path = None
+            else:
+                file_path = temp_path = self._write_temp_file(audio_file)
+            
+            try:
+                # Load and process the audio file
+                audio_data, sample_rate = librosa.load(file_path, sr=self.sample_rate)
+            finally:
+                # Clean up temporary file
+                if temp_path:
+                    os.remove(temp_path)
             
             # Extract basic features
             features = {
@@ -82,9 +109,6 @@ class AudioProcessingService:
                 'spectral_centroid': np.mean(librosa.feature.spectral_centroid(y=audio_data, sr=sample_rate)),
             }
             
-            # Clean up temporary file
-            os.remove(temp_path)
-            
             return features
             
         except Exception as e:
@@ -140,13 +164,7 @@ class AudioProcessingService:
             file_path = audio_file.path
         else:
             # If it's a file object, save it temporarily
-            temp_path = os.path.join(settings.MEDIA_ROOT, 'temp', audio_file.name)
-            os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-            
-            with open(temp_path, 'wb+') as destination:
-                for chunk in audio_file.chunks():
-                    destination.write(chunk)
-            file_path = temp_path
+            file_path = self._write_temp_file(audio_file)
         
         try:
             # Load the audio file
@@ -1,4 +1,5 @@
 from django.core.mail import send_mail
+from django.core.cache import cache
 from django.conf import settings
 from django.template.loader import render_to_string
 from Apps.communication.models import EmailTemplate, EmailTracking, EmailAnalytics
@@ -8,11 +9,20 @@ from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Cache entry for EmailAnalyticsViewSet.summary, dropped whenever analytics change
+ANALYTICS_SUMMARY_CACHE_KEY = 'email:analytics:summary'
+ANALYTICS_SUMMARY_CACHE_TIMEOUT = getattr(settings, 'EMAIL_ANALYTICS_SUMMARY_CACHE_TIMEOUT', 60)
+
 class EmailService:
     """Service for handling email operations"""
     
     def __init__(self):
         self.default_from_email = settings.DEFAULT_FROM_EMAIL
+
+    @staticmethod
+    def invalidate_analytics_summary():
+        """Drop the cached analytics summary after analytics rows change"""
+        cache.delete(ANALYTICS_SUMMARY_CACHE_KEY)
         
     def send_email(self, recipient_email, subject, message, html_message=None):
         """
@@ -44,6 +54,7 @@ class EmailService:
             analytics = EmailAnalytics.objects.create(
                 email_id=str(tracking.tracking_id)
             )
+            self.invalidate_analytics_summary()
             
             # Send email
             result = send_mail(
@@ -122,6 +133,7 @@ class EmailService:
             tracking.save()
             
             analytics.increment_opens()
+            self.invalidate_analytics_summary()
             
         except (EmailTracking.DoesNotExist, EmailAnalytics.DoesNotExist):
             logger.error(f"Failed to track email open for tracking_id: {tracking_id}")
@@ -143,6 +155,7 @@ class EmailService:
             tracking.save()
             
             analytics.increment_clicks()
+            self.invalidate_analytics_summary()
             
         except (EmailTracking.DoesNotExist, EmailAnalytics.DoesNotExist):
             logger.error(f"Failed to track email click for tracking_id: {tracking_id}")
@@ -165,6 +178,7 @@ class EmailService:
             tracking.save()
             
             analytics.increment_bounces()
+            self.invalidate_analytics_summary()
             
         except (EmailTracking.DoesNotExist, EmailAnalytics.DoesNotExist):
             logger.error(f"Failed to track email bounce for tracking_id: {tracking_id}")
@@ -1,16 +1,26 @@
 import openai
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.core.files.base import File
 from typing import Dict, Optional, Union
 import os
+import hashlib
 import mimetypes
+import threading
 
 class TranscriptionService:
+    # Process-wide instance handed out by get_shared()
+    _shared = None
+    _shared_lock = threading.Lock()
+
     def __init__(self):
         self.api_key = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         openai.api_key = self.api_key
+        # Hosted model used for every request; deployments can pick a faster one
+        self.model = getattr(settings, 'TRANSCRIPTION_MODEL', 'whisper-1')
+        self.cache_timeout = getattr(settings, 'TRANSCRIPTION_CACHE_TIMEOUT', 86400)
 
         # Supported languages and their locales
         self.supported_languages = {
@@ -18,6 +28,15 @@ class TranscriptionService:
             'en': ['en-US', 'en-GB', 'en-AU', 'en-CA']  # English locales
         }
 
+    @classmethod
+    def get_shared(cls) -> 'TranscriptionService':
+        """Return an instance shared by the whole process, created on first use."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
     def transcribe_audio(self, audio_file: Union[UploadedFile, File], language: str = 'auto') -> Dict[str, str]:
         """
         Transcribe an audio file using OpenAI's Whisper model.
@@ -34,13 +53,12 @@ class TranscriptionService:
         Returns:
             Dict containing the transcribed text and detected language
         """
-        self._validate_audio_file(audio_file)
-        self._validate_language(language)
+        self.validate_request(audio_file, language)
         
         try:
             # Prepare parameters for OpenAI API
             params = {
-                "model": "whisper-1",
+                "model": self.model,
                 "file": audio_file
             }
             
@@ -60,6 +78,25 @@ class TranscriptionService:
         except Exception as e:
             raise Exception(f"API Error: {str(e)}")
 
+    def validate_request(self, audio_file, language: str = 'auto') -> None:
+        """
+        Validate an audio file and language before transcribing them.
+        
+        Raises:
+            ValueError: If the file type, file size or language is not supported
+        """
+        self._validate_audio_file(audio_file)
+        self._validate_language(language)
+
+    def get_cache_key(self, audio_file, language: str) -> str:
+        """Generate cache key for a transcription of the audio content"""
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in audio_file.chunks():
+            digest.update(chunk)
+        # Leave the file readable from the start for whoever uses it next
+        audio_file.seek(0)
+        return f"transcription:{digest.hexdigest()}:{language}:{self.model}"
+
     def _validate_audio_file(self, audio_file):
         """Validate the audio file."""
         allowed_types = ['audio/mpeg', 'audio/wav', 'audio/mp4', 'audio/webm']
@@ -0,0 +1,36 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from .services.transcription import TranscriptionService
+
+logger = get_task_logger(__name__)
+
+@shared_task(name='communication.tasks.transcribe_audio')
+def transcribe_audio_task(file_name, content_type, language='ar', cache_key=None):
+    """
+    Transcribe an uploaded audio file outside the request cycle.
+    
+    Args:
+        file_name (str): Storage name of the uploaded audio file
+        content_type (str): Content type reported for the upload
+        language (str): Language code or locale to transcribe
+        cache_key (str, optional): Key the result is cached under for repeat uploads
+        
+    Returns:
+        dict: The transcribed text and detected language
+    """
+    service = TranscriptionService.get_shared()
+    try:
+        with default_storage.open(file_name, 'rb') as audio_file:
+            audio_file.content_type = content_type
+            result = service.transcribe_audio(audio_file, language=language)
+        if cache_key:
+            cache.set(cache_key, result, service.cache_timeout)
+        return result
+    except Exception as e:
+        logger.error(f"Error transcribing {file_name}: {str(e)}")
+        raise
+    finally:
+        # The upload only exists for this job
+        default_storage.delete(file_name)
@@ -0,0 +1,44 @@
+import array
+import math
+import os
+import wave
+from functools import lru_cache
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+SAMPLE_RATE = 44100
+
+
+@lru_cache(maxsize=None)
+def sine_wave_frames(frequency=440, sample_rate=SAMPLE_RATE):
+    """Return 16-bit mono frames of a 1 second sine wave.
+
+    Built with the stdlib, which keeps numpy/scipy out of test collection,
+    and only once per process.
+    """
+    samples = array.array('h', (
+        int(math.sin(2 * math.pi * frequency * i / sample_rate) * 32767)
+        for i in range(sample_rate)
+    ))
+    return samples.tobytes()
+
+
+def write_test_wav(name='test'):
+    """Write the sine wave as a WAV file under MEDIA_ROOT/temp and return its path.
+
+    The path includes the process id to avoid conflicts in parallel testing.
+    """
+    temp_dir = os.path.join(settings.MEDIA_ROOT, 'temp')
+    os.makedirs(temp_dir, exist_ok=True)
+    path = os.path.join(temp_dir, f'{name}_{os.getpid()}.wav')
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(sine_wave_frames())
+    return path
+
+
+def unsupported_audio_upload():
+    """Return a text upload built in memory, so parallel workers never share a path."""
+    return SimpleUploadedFile('test.txt', b'Not an audio file', content_type='text/plain')
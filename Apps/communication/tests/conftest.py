@@ -0,0 +1,66 @@
+import pytest
+from django.contrib.auth import get_user_model
+from Apps.communication.models import Thread, Language
+
+User = get_user_model()
+
+
+@pytest.fixture(scope='module')
+def thread_participants(django_db_setup, django_db_blocker):
+    """Create two users and a shared thread once per test module.
+
+    The rows are committed outside the per-test transactions, so they are
+    removed explicitly when the module finishes.
+    """
+    with django_db_blocker.unblock():
+        user1 = User.objects.create_user(
+            username='user1',
+            email='user1@example.com',
+            password='testpass123'
+        )
+        user2 = User.objects.create_user(
+            username='user2',
+            email='user2@example.com',
+            password='testpass123'
+        )
+        thread = Thread.objects.create(
+            title='Test Thread',
+            created_by=user1
+        )
+        thread.participants.add(user1, user2)
+
+    yield user1, user2, thread
+
+    with django_db_blocker.unblock():
+        thread.delete()
+        User.objects.filter(pk__in=[user1.pk, user2.pk]).delete()
+
+
+@pytest.fixture
+def user1(db, thread_participants):
+    return thread_participants[0]
+
+
+@pytest.fixture
+def user2(db, thread_participants):
+    return thread_participants[1]
+
+
+@pytest.fixture
+def thread(db, thread_participants):
+    return thread_participants[2]
+
+
+@pytest.fixture(scope='module')
+def languages(django_db_setup, django_db_blocker):
+    """Create the Spanish and Arabic languages once per test module."""
+    with django_db_blocker.unblock():
+        languages = {
+            'es': Language.objects.get_or_create(code='es', name='Spanish')[0],
+            'ar': Language.objects.get_or_create(code='ar', name='Arabic')[0],
+        }
+
+    yield languages
+
+    with django_db_blocker.unblock():
+        Language.objects.filter(pk__in=[language.pk for language in languages.values()]).delete()
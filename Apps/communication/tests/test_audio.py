@@ -2,7 +2,8 @@ import os
 import tempfile
 import numpy as np
 from django.test import TestCase
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from unittest.mock import patch
 from django.conf import settings
 from ..services.audio import AudioProcessingService
 
@@ -88,6 +89,21 @@ class TestAudioProcessingService(TestCase):
         self.assertEqual(features['channels'], 1)
         self.assertAlmostEqual(features['duration'], 1.0, places=1)
     
+    def test_process_audio_reads_spooled_upload_in_place(self):
+        # Large uploads arrive on disk; they should not be copied again
+        audio_file = TemporaryUploadedFile('test.wav', 'audio/wav', 0, None)
+        with open(self.test_wav_path, 'rb') as f:
+            audio_file.write(f.read())
+        audio_file.size = audio_file.tell()
+        audio_file.seek(0)
+        
+        with patch.object(self.audio_service, '_write_temp_file') as mock_write:
+            features = self.audio_service.process_audio(audio_file)
+        audio_file.close()
+        
+        mock_write.assert_not_called()
+        self.assertAlmostEqual(features['duration'], 1.0, places=1)
+    
     def test_normalize_audio(self):
         # Create test audio data
         audio_data = np.array([0.1, 0.5, -0.3, 0.8, -0.9])
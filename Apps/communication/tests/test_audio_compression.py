@@ -1,13 +1,10 @@
 import os
-import tempfile
-import numpy as np
 from django.test import TestCase
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
-from django.conf import settings
 from ..services.audio import AudioProcessingService
+from .audio_helpers import unsupported_audio_upload, write_test_wav
 
 class TestAudioCompression(TestCase):
     def setUp(self):
@@ -19,26 +16,8 @@ class TestAudioCompression(TestCase):
         )
         self.client.force_authenticate(user=self.user)
         self.audio_service = AudioProcessingService()
-        
-        # Ensure media/temp directory exists
-        self.temp_dir = os.path.join(settings.MEDIA_ROOT, 'temp')
-        os.makedirs(self.temp_dir, exist_ok=True)
-        
-        # Use process-specific filename to avoid conflicts in parallel testing
-        pid = os.getpid()
-        self.test_wav_path = os.path.join(self.temp_dir, f'test_{pid}.wav')
-        
-        # Create a simple test WAV file
-        sample_rate = 44100
-        duration = 1.0  # seconds
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        audio_data = np.sin(2 * np.pi * 440 * t)  # 440 Hz sine wave
-        audio_data = (audio_data * 32767).astype(np.int16)
-        
-        # Save as WAV file
-        import scipy.io.wavfile as wav
-        wav.write(self.test_wav_path, sample_rate, audio_data)
-        
+        self.test_wav_path = write_test_wav()
+
     def tearDown(self):
         # Clean up test file
         if os.path.exists(self.test_wav_path):
@@ -107,19 +86,10 @@ class TestAudioCompression(TestCase):
     
     def test_audio_compression_unsupported_format(self):
         """Test that the audio compression endpoint handles unsupported formats."""
-        # Create an unsupported audio file
-        unsupported_path = os.path.join(tempfile.gettempdir(), 'test.txt')
-        with open(unsupported_path, 'w') as f:
-            f.write('Not an audio file')
-        
         # Upload unsupported file
-        with open(unsupported_path, 'rb') as f:
-            response = self.client.post(
-                reverse('communication:audio-upload'),
-                {'audio_file': f},
-                format='multipart'
-            )
-        self.assertEqual(response.status_code, 400)
-        
-        # Clean up
-        os.remove(unsupported_path) 
\ No newline at end of file
+        response = self.client.post(
+            reverse('communication:audio-upload'),
+            {'audio_file': unsupported_audio_upload()},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, 400) 
\ No newline at end of file
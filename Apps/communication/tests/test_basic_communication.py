@@ -9,11 +9,15 @@ import pytest_asyncio
 
 User = get_user_model()
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
-class BasicCommunicationTest:
+class TestBasicCommunication:
     @pytest_asyncio.fixture(autouse=True)
-    async def setup(self):
+    async def setup(self, settings):
+        # Keep the channel layer in-process instead of connecting to Redis
+        settings.CHANNEL_LAYERS = {
+            'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}
+        }
         self.user = await User.objects.acreate(
             username='testuser',
             email='test@example.com',
@@ -21,14 +25,20 @@ class BasicCommunicationTest:
         )
         self.channel_layer = get_channel_layer()
 
-    async def test_websocket_connection(self):
-        """
-        Test that a user can establish a WebSocket connection
-        """
+    def communicator(self):
+        """Connect to the chat consumer directly, supplying the route kwargs the URL router would"""
         communicator = WebsocketCommunicator(
             ChatConsumer.as_asgi(),
             f"/ws/chat/{self.user.id}/"
         )
+        communicator.scope['url_route'] = {'kwargs': {'user_id': str(self.user.id)}}
+        return communicator
+
+    async def test_websocket_connection(self):
+        """
+        Test that a user can establish a WebSocket connection
+        """
+        communicator = self.communicator()
         connected, _ = await communicator.connect()
         assert connected
         await communicator.disconnect()
@@ -37,10 +47,7 @@ class BasicCommunicationTest:
         """
         Test that a user can send a message through WebSocket
         """
-        communicator = WebsocketCommunicator(
-            ChatConsumer.as_asgi(),
-            f"/ws/chat/{self.user.id}/"
-        )
+        communicator = self.communicator()
         await communicator.connect()
 
         # Send a message
@@ -62,10 +69,7 @@ class BasicCommunicationTest:
         """
         Test that a user can receive messages sent to them
         """
-        communicator = WebsocketCommunicator(
-            ChatConsumer.as_asgi(),
-            f"/ws/chat/{self.user.id}/"
-        )
+        communicator = self.communicator()
         await communicator.connect()
 
         # Send a message through the channel layer
@@ -1,5 +1,5 @@
 from channels.testing import WebsocketCommunicator
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import path
 from channels.routing import URLRouter
 from channels.auth import AuthMiddlewareStack
@@ -13,6 +13,7 @@ import json
 
 User = get_user_model()
 
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
 class WebSocketConsumerTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from channels.layers import get_channel_layer
 from channels.testing import ApplicationCommunicator
 from channels.consumer import AsyncConsumer
@@ -13,6 +13,7 @@ class TestConsumer(AsyncConsumer):
             "text": message["text"],
         })
 
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
 class MessageQueueTest(TestCase):
     async def test_redis_connection(self):
         channel_layer = get_channel_layer()
@@ -214,6 +214,17 @@ def test_rich_text_nested_formatting():
     assert "<em>italic</em>" in formatted
     assert "<code>code</code>" in formatted 
 
+def test_rich_text_triple_emphasis_markers():
+    """Test triple markers render bold and italic without stray asterisks"""
+    formatter = RichTextFormatter()
+
+    for content in ("***x***", "Hello ***world***", "*it***bold**", "***a** b*"):
+        assert formatter.validate(content)
+        formatted = formatter.format(content)
+        assert "*" not in formatted
+        assert "<strong>" in formatted
+        assert "<em>" in formatted
+
 def test_rich_text_validation_media_types():
     """Test media type validation"""
     formatter = RichTextFormatter()
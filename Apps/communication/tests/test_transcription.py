@@ -1,135 +1,288 @@
-import os
+import pytest
 from unittest.mock import patch, MagicMock
-from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APIClient
 from ..services.transcription import TranscriptionService
+from ..tasks import transcribe_audio_task
 from ..models import Audio
 
-class TestTranscriptionService(TestCase):
-    def setUp(self):
-        # Mock environment variable
-        self.env_patcher = patch.dict('os.environ', {'OPENAI_API_KEY': 'test_key'})
-        self.env_patcher.start()
-        
-        # Create test user and audio file
-        self.user = self.create_user()
-        self.audio = self.create_audio_file()
-        
-        # Initialize service
-        self.transcription_service = TranscriptionService()
-
-    def tearDown(self):
-        self.env_patcher.stop()
-
-    def create_user(self):
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        return User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass'
-        )
 
-    def create_audio_file(self):
-        content = b'test audio content'
-        file = SimpleUploadedFile(
-            name='test_audio.wav',
-            content=content,
-            content_type='audio/wav'
-        )
+@pytest.fixture(scope='class')
+def env_patcher():
+    """Provide a fake OpenAI API key for the whole test class."""
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test_key'}):
+        yield
+
+
+@pytest.fixture(scope='class')
+def audio(django_db_setup, django_db_blocker):
+    """Create one audio file shared by the test class.
+
+    The tests only read the file, so the row and upload are created once
+    and removed explicitly when the class finishes.
+    """
+    file = SimpleUploadedFile(
+        name='test_audio.wav',
+        content=b'test audio content',
+        content_type='audio/wav'
+    )
+    with django_db_blocker.unblock():
         audio = Audio.objects.create(
             file=file,
             duration=10.0,
             sample_rate=44100,
             channels=2
         )
-        audio.file.content_type = 'audio/wav'  # Ensure content_type is set on the file
-        return audio
+    audio.file.content_type = 'audio/wav'  # Ensure content_type is set on the file
+
+    yield audio
+
+    with django_db_blocker.unblock():
+        audio.file.delete(save=False)
+        audio.delete()
 
-    @patch('openai.Audio.transcribe')
-    def test_transcribe_audio_success_english(self, mock_transcribe):
+
+@pytest.fixture(scope='class')
+def transcription_service(env_patcher):
+    return TranscriptionService()
+
+
+@pytest.fixture
+def mock_transcribe():
+    with patch('openai.Audio.transcribe') as mock:
+        yield mock
+
+
+class TestTranscriptionService:
+    def test_get_shared_reuses_instance(self, env_patcher):
+        with patch.object(TranscriptionService, '_shared', None):
+            shared = TranscriptionService.get_shared()
+            assert TranscriptionService.get_shared() is shared
+
+    def test_transcribe_audio_success_english(self, transcription_service, audio, mock_transcribe):
         # Mock successful English transcription
-        mock_response = {
+        mock_transcribe.return_value = {
             'text': 'Hello world',
             'language': 'en'
         }
-        mock_transcribe.return_value = mock_response
-        
-        result = self.transcription_service.transcribe_audio(self.audio.file, language='en')
-        
-        self.assertEqual(result['text'], 'Hello world')
-        self.assertEqual(result['language'], 'en')
+
+        result = transcription_service.transcribe_audio(audio.file, language='en')
+
+        assert result['text'] == 'Hello world'
+        assert result['language'] == 'en'
         mock_transcribe.assert_called_once()
 
-    @patch('openai.Audio.transcribe')
-    def test_transcribe_audio_success_arabic(self, mock_transcribe):
+    def test_transcribe_audio_uses_configured_model(self, env_patcher, audio, mock_transcribe, settings):
+        settings.TRANSCRIPTION_MODEL = 'whisper-fast'
+        mock_transcribe.return_value = {'text': 'Hello world', 'language': 'en'}
+
+        TranscriptionService().transcribe_audio(audio.file, language='en')
+
+        assert mock_transcribe.call_args.kwargs['model'] == 'whisper-fast'
+
+    def test_transcribe_audio_success_arabic(self, transcription_service, audio, mock_transcribe):
         # Mock successful Arabic transcription
-        mock_response = {
+        mock_transcribe.return_value = {
             'text': 'مرحبا بالعالم',
             'language': 'ar'
         }
-        mock_transcribe.return_value = mock_response
-        
-        result = self.transcription_service.transcribe_audio(self.audio.file, language='ar')
-        
-        self.assertEqual(result['text'], 'مرحبا بالعالم')
-        self.assertEqual(result['language'], 'ar')
+
+        result = transcription_service.transcribe_audio(audio.file, language='ar')
+
+        assert result['text'] == 'مرحبا بالعالم'
+        assert result['language'] == 'ar'
         mock_transcribe.assert_called_once()
 
-    @patch('openai.Audio.transcribe')
-    def test_transcribe_audio_with_auto_detect(self, mock_transcribe):
+    def test_transcribe_audio_with_auto_detect(self, transcription_service, audio, mock_transcribe):
         # Mock auto-detection (returns Arabic)
-        mock_response = {
+        mock_transcribe.return_value = {
             'text': 'مرحبا',
             'language': 'ar'
         }
-        mock_transcribe.return_value = mock_response
-        
-        result = self.transcription_service.transcribe_audio(self.audio.file, language='auto')
-        
-        self.assertEqual(result['text'], 'مرحبا')
-        self.assertEqual(result['language'], 'ar')
+
+        result = transcription_service.transcribe_audio(audio.file, language='auto')
+
+        assert result['text'] == 'مرحبا'
+        assert result['language'] == 'ar'
         mock_transcribe.assert_called_once()
 
-    @patch('openai.Audio.transcribe')
-    def test_transcribe_audio_with_different_locales(self, mock_transcribe):
+    def test_transcribe_audio_with_different_locales(self, transcription_service, audio, mock_transcribe):
         """Test transcription with different locales."""
         locales = ['ar-SA', 'en-US']
 
         for locale in locales:
-            mock_response = {'text': 'Test text', 'language': locale}
-            mock_transcribe.return_value = mock_response
+            mock_transcribe.return_value = {'text': 'Test text', 'language': locale}
 
-            result = self.transcription_service.transcribe_audio(self.audio.file, locale)
-            self.assertEqual(result['text'], 'Test text')
-            self.assertEqual(result['language'], locale)  # Compare with full locale instead of just language code
+            result = transcription_service.transcribe_audio(audio.file, locale)
+            assert result['text'] == 'Test text'
+            assert result['language'] == locale  # Compare with full locale instead of just language code
 
-    @patch('openai.Audio.transcribe')
-    def test_transcribe_audio_with_api_error(self, mock_transcribe):
+    def test_transcribe_audio_with_api_error(self, transcription_service, audio, mock_transcribe):
         """Test transcription with API error."""
         mock_transcribe.side_effect = Exception("Transcription failed")
-        
-        with self.assertRaises(Exception) as context:
-            self.transcription_service.transcribe_audio(self.audio.file, language='en')
-        
-        self.assertTrue('Transcription failed' in str(context.exception))
 
-    def test_transcribe_audio_with_invalid_file(self):
+        with pytest.raises(Exception, match='Transcription failed'):
+            transcription_service.transcribe_audio(audio.file, language='en')
+
+    def test_transcribe_audio_with_invalid_file(self, transcription_service):
         # Test with invalid file type
         invalid_file = SimpleUploadedFile('test.txt', b'invalid content', content_type='text/plain')
-        
-        with self.assertRaises(ValueError) as context:
-            self.transcription_service.transcribe_audio(invalid_file)
-        
-        self.assertTrue('Invalid file type' in str(context.exception))
-
-    def test_validate_audio_file(self):
-        # Test file size validation
-        large_content = b'x' * (25 * 1024 * 1024 + 1)  # Slightly over 25MB
-        large_file = SimpleUploadedFile('large.mp3', large_content, content_type='audio/mpeg')
-        large_file.size = len(large_content)  # Explicitly set the size attribute
-        
-        with self.assertRaises(ValueError) as context:
-            self.transcription_service._validate_audio_file(large_file)
-        
-        self.assertTrue('File size exceeds 25MB limit' in str(context.exception)) 
\ No newline at end of file
+
+        with pytest.raises(ValueError, match='Invalid file type'):
+            transcription_service.transcribe_audio(invalid_file)
+
+    def test_validate_audio_file(self, transcription_service):
+        # Test file size validation; only the size is checked, so no bytes are needed
+        large_file = MagicMock(spec=SimpleUploadedFile)
+        large_file.name = 'large.mp3'
+        large_file.content_type = 'audio/mpeg'
+        large_file.size = 25 * 1024 * 1024 + 1  # Slightly over 25MB
+
+        with pytest.raises(ValueError, match='File size exceeds 25MB limit'):
+            transcription_service._validate_audio_file(large_file)
+
+
+@pytest.fixture
+def api_user(db, django_user_model):
+    return django_user_model.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass'
+    )
+
+
+@pytest.fixture
+def api_client(api_user):
+    client = APIClient()
+    client.force_authenticate(user=api_user)
+    return client
+
+
+@pytest.mark.usefixtures('env_patcher')
+class TestTranscriptionJobs:
+    def test_transcribe_audio_queues_job(self, api_client, api_user):
+        upload = SimpleUploadedFile('clip.wav', b'test audio content', content_type='audio/wav')
+
+        with patch('Apps.communication.views.transcribe_audio_task.delay') as mock_delay, \
+                patch.object(cache, 'set', wraps=cache.set) as mock_cache_set:
+            mock_delay.return_value = MagicMock(id='job-1')
+            response = api_client.post(
+                reverse('communication:transcribe-audio'),
+                {'audio_file': upload, 'language': 'en'},
+                format='multipart'
+            )
+
+        assert response.status_code == 202
+        assert response.json() == {'job_id': 'job-1', 'status': 'pending'}
+        file_name, content_type, language, cache_key = mock_delay.call_args.args
+        assert (content_type, language) == ('audio/wav', 'en')
+        assert cache_key.startswith('transcription:')
+        assert cache.get('transcription_job:job-1') == api_user.pk
+        # Ownership lapses with the Celery result rather than outliving it
+        mock_cache_set.assert_called_once_with('transcription_job:job-1', api_user.pk, settings.CELERY_RESULT_EXPIRES)
+        cache.delete('transcription_job:job-1')
+        # The worker owns the stored upload; clean up in its place
+        assert default_storage.exists(file_name)
+        default_storage.delete(file_name)
+
+    def test_transcribe_audio_returns_cached_result(self, api_client):
+        upload = SimpleUploadedFile('clip.wav', b'cached audio content', content_type='audio/wav')
+        cache_key = TranscriptionService.get_shared().get_cache_key(upload, 'en')
+        cache.set(cache_key, {'text': 'Hello world', 'language': 'en'})
+
+        with patch('Apps.communication.views.transcribe_audio_task.delay') as mock_delay:
+            response = api_client.post(
+                reverse('communication:transcribe-audio'),
+                {'audio_file': upload, 'language': 'en'},
+                format='multipart'
+            )
+        cache.delete(cache_key)
+
+        assert response.status_code == 200
+        assert response.json() == {'text': 'Hello world', 'language': 'en'}
+        mock_delay.assert_not_called()
+
+    def test_transcribe_audio_rejects_invalid_file(self, api_client):
+        upload = SimpleUploadedFile('notes.txt', b'not audio', content_type='text/plain')
+
+        with patch('Apps.communication.views.transcribe_audio_task.delay') as mock_delay:
+            response = api_client.post(
+                reverse('communication:transcribe-audio'),
+                {'audio_file': upload},
+                format='multipart'
+            )
+
+        assert response.status_code == 400
+        mock_delay.assert_not_called()
+
+    def test_transcription_status(self, api_client, api_user):
+        cache.set('transcription_job:job-1', api_user.pk)
+        with patch('Apps.communication.views.AsyncResult') as mock_result:
+            mock_result.return_value.status = 'SUCCESS'
+            mock_result.return_value.successful.return_value = True
+            mock_result.return_value.result = {'text': 'Hello world', 'language': 'en'}
+            response = api_client.get(
+                reverse('communication:transcription-status', kwargs={'job_id': 'job-1'})
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            'job_id': 'job-1',
+            'status': 'success',
+            'result': {'text': 'Hello world', 'language': 'en'}
+        }
+        cache.delete('transcription_job:job-1')
+
+    def test_transcription_status_hides_worker_errors(self, api_client, api_user):
+        cache.set('transcription_job:job-3', api_user.pk)
+        with patch('Apps.communication.views.AsyncResult') as mock_result:
+            mock_result.return_value.status = 'FAILURE'
+            mock_result.return_value.successful.return_value = False
+            mock_result.return_value.failed.return_value = True
+            mock_result.return_value.result = RuntimeError('secret internal detail')
+            response = api_client.get(
+                reverse('communication:transcription-status', kwargs={'job_id': 'job-3'})
+            )
+        cache.delete('transcription_job:job-3')
+
+        assert response.status_code == 200
+        assert response.json() == {'job_id': 'job-3', 'status': 'failure', 'error': 'Transcription failed'}
+
+    def test_transcription_status_of_another_user(self, api_client, django_user_model):
+        other = django_user_model.objects.create_user(
+            username='otheruser', email='other@example.com', password='testpass'
+        )
+        cache.set('transcription_job:job-2', other.pk)
+        with patch('Apps.communication.views.AsyncResult') as mock_result:
+            response = api_client.get(
+                reverse('communication:transcription-status', kwargs={'job_id': 'job-2'})
+            )
+        cache.delete('transcription_job:job-2')
+
+        assert response.status_code == 404
+        mock_result.assert_not_called()
+
+    def test_transcription_status_of_unknown_job(self, api_client):
+        with patch('Apps.communication.views.AsyncResult') as mock_result:
+            response = api_client.get(
+                reverse('communication:transcription-status', kwargs={'job_id': 'never-issued'})
+            )
+
+        assert response.status_code == 404
+        mock_result.assert_not_called()
+
+    def test_transcribe_audio_task(self, mock_transcribe):
+        mock_transcribe.return_value = {'text': 'Hello world', 'language': 'en'}
+        file_name = default_storage.save('temp/transcriptions/clip.wav', ContentFile(b'test audio content'))
+
+        result = transcribe_audio_task(file_name, 'audio/wav', 'en', 'transcription:test')
+
+        assert result == {'text': 'Hello world', 'language': 'en'}
+        assert cache.get('transcription:test') == result
+        assert not default_storage.exists(file_name)
+        cache.delete('transcription:test')
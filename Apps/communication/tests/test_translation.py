@@ -5,18 +5,22 @@ from Apps.communication.models import Translation, Language
 from Apps.communication.services.translation import TranslationService
 from Apps.communication.exceptions import TranslationError
 from unittest.mock import Mock, patch
-from django.core.cache import cache
+from django.core.cache import caches
 
 class TestTranslationService(TestCase):
+    @pytest.fixture(autouse=True)
+    def _languages(self, languages):
+        self.languages = languages
+
     def setUp(self):
         self.service = TranslationService()
         self.source_text = "Hello, world!"
-        self.target_language = Language.objects.get_or_create(code="es", name="Spanish")[0]
+        self.target_language = self.languages['es']
         self.source_language = "en"
         self.target_text = "¡Hola, mundo!"
         self.quality_score = 0.95
-        # Clear cache before each test
-        cache.clear()
+        # Test settings use LocMemCache, so this is an in-process dict clear
+        caches['default'].clear()
 
     def test_translate_text(self):
         # Arrange
@@ -41,7 +45,7 @@ class TestTranslationService(TestCase):
 
     def test_translate_to_arabic(self):
         # Arrange
-        arabic_language = Language.objects.get_or_create(code="ar", name="Arabic")[0]
+        arabic_language = self.languages['ar']
         arabic_text = "مرحبا بالعالم"
 
         with patch('Apps.communication.services.translation.TranslationService._call_translation_api') as mock_translate:
@@ -83,7 +87,7 @@ class TestTranslationService(TestCase):
             # Assert
             self.assertEqual(result1.target_text, result2.target_text)
             self.assertEqual(result1.id, result2.id)
-            mock_translate.assert_called_once()
+            self.assertEqual(mock_translate.call_count, 1)
 
     def test_detect_language(self):
         # Arrange
@@ -116,13 +120,16 @@ class TestTranslationService(TestCase):
             mock_detect.assert_called_once_with(text)
 
 class TestTranslationModel(TestCase):
-    def setUp(self):
-        self.language = Language.objects.get_or_create(code="es", name="Spanish")[0]
-        self.translation = Translation.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        # No test mutates these rows, so they are created once per class
+        cls.language = Language.objects.get_or_create(code="es", name="Spanish")[0]
+        cls.arabic = Language.objects.get_or_create(code="ar", name="Arabic")[0]
+        cls.translation = Translation.objects.create(
             source_text="Hello",
             target_text="Hola",
             source_language="en",
-            target_language=self.language,
+            target_language=cls.language,
             quality_score=0.95
         )
 
@@ -142,24 +149,22 @@ class TestTranslationModel(TestCase):
         self.assertEqual(str(self.language), expected)
 
     def test_arabic_translation_creation(self):
-        arabic = Language.objects.get_or_create(code="ar", name="Arabic")[0]
         translation = Translation.objects.create(
             source_text="Hello",
             target_text="مرحبا",
             source_language="en",
-            target_language=arabic,
+            target_language=self.arabic,
             quality_score=0.95
         )
         self.assertEqual(translation.target_text, "مرحبا")
         self.assertEqual(translation.target_language.code, "ar")
 
     def test_arabic_translation_str(self):
-        arabic = Language.objects.get_or_create(code="ar", name="Arabic")[0]
         translation = Translation.objects.create(
             source_text="Hello",
             target_text="مرحبا",
             source_language="en",
-            target_language=arabic,
+            target_language=self.arabic,
             quality_score=0.95
         )
         expected = "Translation from en to ar: Hello -> مرحبا"
@@ -1,7 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import upload_audio, play_audio, compress_audio, transcribe_audio
-from Apps.communication.views import (
+from .views import (
+    upload_audio,
+    play_audio,
+    compress_audio,
+    transcribe_audio,
+    transcription_status,
     EmailTemplateViewSet,
     EmailTrackingViewSet,
     EmailAnalyticsViewSet
@@ -21,6 +25,7 @@ urlpatterns = [
     path('audio/play/<int:audio_id>/', play_audio, name='audio-playback'),
     path('audio/compress/<int:audio_id>/', compress_audio, name='audio-compress'),
     path('transcribe/', transcribe_audio, name='transcribe-audio'),
+    path('transcribe/<str:job_id>/', transcription_status, name='transcription-status'),
     
     # Email-related URLs
     path('', include(router.urls)),
@@ -1,7 +1,8 @@
-from django.http import HttpResponse, Http404, HttpResponseNotModified
+from django.http import HttpResponse, FileResponse, Http404, HttpResponseNotModified
 from django.views.decorators.http import require_http_methods
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.core.cache import cache
 from django.conf import settings
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -10,14 +11,24 @@ from rest_framework import status
 from .models import Audio
 from .services.audio import AudioProcessingService
 from .services.transcription import TranscriptionService
+from .tasks import transcribe_audio_task
+from celery.result import AsyncResult
+import logging
 import os
 import re
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Sum
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from Apps.communication.models import EmailTemplate, EmailTracking, EmailAnalytics
 from Apps.communication.serializers import EmailTemplateSerializer, EmailTrackingSerializer, EmailAnalyticsSerializer
-from Apps.communication.services.email_service import EmailService
+from Apps.communication.services.email_service import (
+    EmailService,
+    ANALYTICS_SUMMARY_CACHE_KEY,
+    ANALYTICS_SUMMARY_CACHE_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -64,6 +75,32 @@ def upload_audio(request):
         'file_size': audio.get_file_size()
     }, status=status.HTTP_201_CREATED)
 
+# A Range header play_audio accepts; an empty first byte falls back to the full file
+_RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+# Chunk size used when audio is streamed without a server file wrapper
+AUDIO_STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class _FileRange:
+    """File-like view of ``length`` bytes of an open file, starting at ``offset``."""
+
+    def __init__(self, file, offset, length):
+        file.seek(offset)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def play_audio(request, audio_id):
@@ -79,15 +116,14 @@ def play_audio(request, audio_id):
     
     # Handle range requests
     range_header = request.META.get('HTTP_RANGE', '').strip()
-    if range_header and not re.match(r'bytes=\d*-\d*$', range_header):
+    range_match = _RANGE_RE.match(range_header)
+    if range_header and not range_match:
         return HttpResponse(
             status=400,
             reason='Invalid range format'
         )
     
-    range_match = re.match(r'bytes=(\d+)-(\d*)', range_header)
-    
-    if range_match:
+    if range_match and range_match.group(1):
         first_byte = int(range_match.group(1))  # Convert to integer
         last_byte_str = range_match.group(2)
         
@@ -115,26 +151,23 @@ def play_audio(request, audio_id):
             last_byte = file_size - 1
             length = file_size - first_byte
         
-        response = HttpResponse(
+        # Stream only the requested bytes; FileResponse closes the file
+        response = FileResponse(
+            _FileRange(open(file_path, 'rb'), first_byte, length),
             status=206,
             content_type=content_type
         )
         response['Content-Length'] = str(length)
         response['Content-Range'] = f'bytes {first_byte}-{last_byte}/{file_size}'
-        
-        with open(file_path, 'rb') as f:
-            f.seek(first_byte)
-            response.write(f.read(length))
     else:
-        # Full file request
-        response = HttpResponse(
+        # Full file request; servers with a file wrapper can sendfile() it
+        response = FileResponse(
+            open(file_path, 'rb'),
             content_type=content_type
         )
         response['Content-Length'] = str(file_size)
-        
-        with open(file_path, 'rb') as f:
-            response.write(f.read())
     
+    response.block_size = AUDIO_STREAM_BLOCK_SIZE
     response['Accept-Ranges'] = 'bytes'
     return response 
 
@@ -176,10 +209,10 @@ def compress_audio(request, audio_id):
         
         # Update the audio file with the compressed version
         audio.file = compressed_file
-        audio.save()
+        audio.save(update_fields=['file', 'updated_at'])
         
-        # Get the new file size
-        compressed_size = audio.get_file_size()
+        # The new size is known in process; no need to stat storage again
+        compressed_size = len(compressed_content)
         
         return Response({
             'message': 'Audio compressed successfully',
@@ -195,11 +228,15 @@ def compress_audio(request, audio_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+def _transcription_job_key(job_id):
+    """Cache key holding the id of the user who queued a transcription job."""
+    return f'transcription_job:{job_id}'
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def transcribe_audio(request):
     """
-    Transcribe an audio file using OpenAI's Whisper model.
+    Queue an audio file for transcription with OpenAI's Whisper model.
     Supports Arabic language and its various locales.
     """
     if 'audio_file' not in request.FILES:
@@ -208,15 +245,37 @@ def transcribe_audio(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    audio_file = request.FILES['audio_file']
     language = request.data.get('language', 'ar')
     
     try:
-        transcription_service = TranscriptionService()
-        result = transcription_service.transcribe_audio(
-            request.FILES['audio_file'],
-            language=language
+        # Reject bad input now rather than in the worker
+        transcription_service = TranscriptionService.get_shared()
+        transcription_service.validate_request(audio_file, language)
+        
+        # Identical audio already transcribed is answered straight away
+        cache_key = transcription_service.get_cache_key(audio_file, language)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            return Response(cached_result, status=status.HTTP_200_OK)
+        
+        file_name = default_storage.save(
+            os.path.join('temp', 'transcriptions', audio_file.name),
+            audio_file
+        )
+        task = transcribe_audio_task.delay(
+            file_name, audio_file.content_type, language, cache_key
+        )
+        # Only the requester may read the job's status and transcript; the
+        # entry lapses with the Celery result, after which the id is unknown
+        cache.set(
+            _transcription_job_key(task.id), request.user.pk,
+            min(transcription_service.cache_timeout, settings.CELERY_RESULT_EXPIRES)
+        )
+        return Response(
+            {"job_id": task.id, "status": "pending"},
+            status=status.HTTP_202_ACCEPTED
         )
-        return Response(result, status=status.HTTP_200_OK)
     except ValueError as e:
         return Response(
             {"error": str(e)},
@@ -228,6 +287,26 @@ def transcribe_audio(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def transcription_status(request, job_id):
+    """Report the state of a queued transcription and its result once done."""
+    # Unknown ids and other users' jobs look the same to the caller
+    if cache.get(_transcription_job_key(job_id)) != request.user.pk:
+        return Response(
+            {"error": "Transcription job not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    result = AsyncResult(job_id)
+    data = {"job_id": job_id, "status": result.status.lower()}
+    if result.successful():
+        data["result"] = result.result
+    elif result.failed():
+        # Worker exceptions can expose internals, so only the log gets them
+        logger.error("Transcription job %s failed: %r", job_id, result.result)
+        data["error"] = "Transcription failed"
+    return Response(data, status=status.HTTP_200_OK)
+
 class EmailTemplateViewSet(viewsets.ModelViewSet):
     """ViewSet for managing email templates"""
     queryset = EmailTemplate.objects.all()
@@ -297,12 +376,26 @@ class EmailAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """Get summary analytics for all emails"""
-        total_emails = self.queryset.count()
-        total_opens = sum(analytics.opens for analytics in self.queryset)
-        total_clicks = sum(analytics.clicks for analytics in self.queryset)
-        total_bounces = sum(analytics.bounces for analytics in self.queryset)
+        summary = cache.get_or_set(
+            ANALYTICS_SUMMARY_CACHE_KEY,
+            self._compute_summary,
+            ANALYTICS_SUMMARY_CACHE_TIMEOUT
+        )
+        return Response(summary)
+
+    def _compute_summary(self):
+        totals = self.get_queryset().aggregate(
+            total_emails=Count('id'),
+            total_opens=Sum('opens', default=0),
+            total_clicks=Sum('clicks', default=0),
+            total_bounces=Sum('bounces', default=0)
+        )
+        total_emails = totals['total_emails']
+        total_opens = totals['total_opens']
+        total_clicks = totals['total_clicks']
+        total_bounces = totals['total_bounces']
         
-        return Response({
+        return {
             "total_emails": total_emails,
             "total_opens": total_opens,
             "total_clicks": total_clicks,
@@ -310,4 +403,4 @@ class EmailAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
             "open_rate": (total_opens / total_emails * 100) if total_emails > 0 else 0,
             "click_rate": (total_clicks / total_emails * 100) if total_emails > 0 else 0,
             "bounce_rate": (total_bounces / total_emails * 100) if total_emails > 0 else 0
-        }) 
\ No newline at end of file
+        }
\ No newline at end of file
@@ -9,6 +9,10 @@ class ContactAdmin(admin.ModelAdmin):
     ordering = ('name',)
     raw_id_fields = ('organization', 'department', 'team')
 
+    def save_model(self, request, obj, form, change):
+        # The admin form has already run full_clean on the instance
+        obj.save(skip_validation=True)
+
 @admin.register(ContactGroup)
 class ContactGroupAdmin(admin.ModelAdmin):
     list_display = ('name', 'is_active')
@@ -1,6 +1,9 @@
 from django.core.cache import cache
 from django.conf import settings
 from django.db.models import Prefetch
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ContactCache:
     """
@@ -21,6 +24,14 @@ class ContactCache:
         """Generate cache key for organization contacts"""
         return f"{cls.ORG_CONTACTS_KEY_PREFIX}:{org_id}:contacts"
     
+    @classmethod
+    def _get_contact_data(cls, contact, include_related=False):
+        """Build the value cached for a single contact"""
+        # If including related fields, store the serializer-shaped dict
+        if include_related:
+            return contact.to_cache_dict()
+        return contact
+    
     @classmethod
     def get_contact(cls, contact_id):
         """
@@ -44,31 +55,39 @@ class ContactCache:
             ttl = cls.DEFAULT_TTL
             
         key = cls._get_contact_key(contact.id)
+        value = cls._get_contact_data(contact, include_related)
+        org_key = cls._get_org_contacts_key(contact.organization_id) if contact.organization_id else None
         
-        # If including related fields, use serializer
-        if include_related:
-            from .serializers import ContactSerializer  # Import here to avoid circular import
-            serializer = ContactSerializer(contact)
-            cache_data = serializer.data
-        else:
-            cache_data = contact
-            
-        cache.set(key, cache_data, timeout=ttl)
+        # On Redis, write the contact and invalidate its organization in one round trip
+        client = getattr(cache, 'client', None)
+        if hasattr(client, 'get_client'):
+            try:
+                pipeline = client.get_client(write=True).pipeline()
+                pipeline.set(client.make_key(key), client.encode(value), ex=ttl)
+                if org_key:
+                    pipeline.delete(client.make_key(org_key))
+                pipeline.execute()
+                return
+            except Exception as e:
+                logger.warning(f"Pipelined contact cache write failed, retrying sequentially: {str(e)}")
+        
+        cache.set(key, value, timeout=ttl)
         
         # Also update organization contacts cache
-        cls.invalidate_organization_contacts(contact.organization_id)
+        if org_key:
+            cache.delete(org_key)
     
     @classmethod
     def delete_contact(cls, contact_id, org_id):
         """
         Remove a contact from cache
         """
-        key = cls._get_contact_key(contact_id)
-        cache.delete(key)
+        keys = [cls._get_contact_key(contact_id)]
         
         # Also invalidate organization contacts cache
         if org_id:
-            cls.invalidate_organization_contacts(org_id)
+            keys.append(cls._get_org_contacts_key(org_id))
+        cache.delete_many(keys)
     
     @classmethod
     def get_organization_contacts(cls, org_id):
@@ -84,23 +103,41 @@ class ContactCache:
         """
         Cache all contacts for an organization
         """
+        cls.bulk_set_organization_contacts([org_id], ttl=ttl)
+    
+    @classmethod
+    def bulk_set_organization_contacts(cls, org_ids, ttl=None):
+        """
+        Cache all contacts for several organizations with a single query
+        
+        Args:
+            org_ids: IDs of the organizations to cache
+            ttl: Time to live in seconds (optional)
+        """
         if ttl is None:
             ttl = cls.DEFAULT_TTL
-            
-        key = cls._get_org_contacts_key(org_id)
         
-        # Get all contacts for organization with related fields
+        # Get all contacts for the organizations, loading only the columns
+        # Contact.to_cache_dict reads
         from .models import Contact  # Import here to avoid circular import
-        contacts = Contact.objects.filter(organization_id=org_id).select_related(
+        contacts = Contact.objects.filter(organization_id__in=org_ids).select_related(
             'organization',
-            'created_by',
-            'updated_by'
+            'department',
+            'team'
+        ).only(
+            'id', 'name', 'email', 'phone', 'is_active', 'created_at', 'updated_at',
+            'organization__name', 'department__name', 'team__name'
         )
         
-        # Serialize contacts
-        from .serializers import ContactSerializer  # Import here to avoid circular import
-        serializer = ContactSerializer(contacts, many=True)
-        cache.set(key, serializer.data, timeout=ttl)
+        # Group by organization, keeping the contact ordering
+        org_contacts = {org_id: [] for org_id in org_ids}
+        for contact in contacts:
+            org_contacts[contact.organization_id].append(contact.to_cache_dict())
+        
+        cache.set_many(
+            {cls._get_org_contacts_key(org_id): data for org_id, data in org_contacts.items()},
+            timeout=ttl
+        )
     
     @classmethod
     def invalidate_organization_contacts(cls, org_id):
@@ -111,27 +148,25 @@ class ContactCache:
         cache.delete(key)
     
     @classmethod
-    def bulk_set_contacts(cls, contacts, ttl=None):
+    def bulk_set_contacts(cls, contacts, ttl=None, include_related=False):
         """
         Bulk cache multiple contacts
         
         Args:
             contacts: List of Contact instances
             ttl: Time to live in seconds (optional)
+            include_related: Whether to include related fields in cache
         """
         if ttl is None:
             ttl = cls.DEFAULT_TTL
             
-        # Group contacts by organization
-        org_contacts = {}
+        # Collect contact entries and their organizations in one pass
+        mapping = {}
+        org_ids = set()
         for contact in contacts:
-            if contact.organization_id not in org_contacts:
-                org_contacts[contact.organization_id] = []
-            org_contacts[contact.organization_id].append(contact)
-            
-            # Cache individual contact
-            cls.set_contact(contact, ttl=ttl)
+            mapping[cls._get_contact_key(contact.id)] = cls._get_contact_data(contact, include_related)
+            org_ids.add(contact.organization_id)
         
-        # Update organization caches
-        for org_id in org_contacts:
-            cls.invalidate_organization_contacts(org_id) 
\ No newline at end of file
+        # Cache all contacts, then invalidate each organization once
+        cache.set_many(mapping, timeout=ttl)
+        cache.delete_many([cls._get_org_contacts_key(org_id) for org_id in org_ids]) 
\ No newline at end of file
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-18 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['name'], name='contacts_co_name_6f3a2a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['is_active', 'name'], name='contacts_co_is_acti_49f1d0_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_contact_contacts_co_name_6f3a2a_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['organization', 'is_active'], name='contacts_co_organiz_b3a4e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contacttemplate',
+            index=models.Index(fields=['organization', 'is_active'], name='contacts_co_organiz_7101ae_idx'),
+        ),
+    ]
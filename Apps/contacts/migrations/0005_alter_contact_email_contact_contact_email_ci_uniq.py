@@ -0,0 +1,44 @@
+# Generated by Django 4.2.11 on 2026-10-18 07:17
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.functions.text
+
+
+def lowercase_emails(apps, schema_editor):
+    Contact = apps.get_model('contacts', 'Contact')
+    lower_email = django.db.models.functions.text.Lower('email')
+    duplicates = list(
+        Contact.objects.annotate(email_lower=lower_email)
+        .values('email_lower')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)
+        .order_by('email_lower')
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Cannot add contact_email_ci_uniq: these emails are used by more than '
+            'one contact when compared case-insensitively: ' + ', '.join(duplicates)
+        )
+    Contact.objects.exclude(email=lower_email).update(email=lower_email)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_contact_contacts_co_organiz_b3a4e2_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contact',
+            name='email',
+            field=models.EmailField(max_length=254),
+        ),
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='contact',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='contact_email_ci_uniq', violation_error_message='Contact with this email already exists.'),
+        ),
+    ]
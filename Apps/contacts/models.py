@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -8,12 +9,31 @@ from django.core.validators import validate_email
 from Apps.core.models import TaskAwareModel
 from Apps.entity.models import Organization, Department, Team
 from .cache_manager import ContactCache
-import re
+from .validation import validate_template_fields
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 User = get_user_model()
 
+# Columns written when a contact is soft deleted
+SOFT_DELETE_FIELDS = frozenset({'is_active', 'updated_at'})
+
+# Contact fields checked by Contact.clean or field validators
+VALIDATED_FIELDS = frozenset({
+    'name', 'email', 'phone',
+    'organization', 'organization_id', 'department', 'department_id', 'team', 'team_id',
+})
+
+def _valid_phone(phone):
+    """Check for an optional + and country code 1, then 9-15 digits"""
+    digits = phone[1:] if phone.startswith('+') else phone
+    # isdecimal accepts the same characters as the regex \d; a leading 1
+    # may be the country code, allowing one extra digit
+    return digits.isdecimal() and (
+        9 <= len(digits) <= 15 or (len(digits) == 16 and digits[0] == '1')
+    )
+
+
 class Contact(TaskAwareModel):
     """Contact model representing a person or organization with task handling capabilities"""
     
@@ -34,7 +54,7 @@ class Contact(TaskAwareModel):
         related_name='contacts_updated'
     )
     name = models.CharField(max_length=255)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
     phone = models.CharField(max_length=20)
     organization = models.ForeignKey(
         'entity.Organization',
@@ -63,42 +83,106 @@ class Contact(TaskAwareModel):
         verbose_name = 'Contact'
         verbose_name_plural = 'Contacts'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name']),
+            models.Index(fields=['is_active', 'name']),
+            models.Index(fields=['organization', 'is_active']),
+        ]
+        constraints = [
+            # Emails are unique regardless of case
+            models.UniqueConstraint(
+                Lower('email'),
+                name='contact_email_ci_uniq',
+                violation_error_message='Contact with this email already exists.'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def _format_datetime(value):
+        """Format a datetime the way ContactSerializer renders it"""
+        if value is None:
+            return None
+        value = timezone.localtime(value).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    def to_cache_dict(self):
+        """Build the cached representation, matching ContactSerializer output"""
+        data = {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'organization': self.organization_id,
+            'department': self.department_id,
+            'team': self.team_id,
+            'is_active': self.is_active,
+            'created_at': self._format_datetime(self.created_at),
+            'updated_at': self._format_datetime(self.updated_at),
+        }
+        # Like the serializer, leave out the names of unset relations
+        if self.organization_id:
+            data['organization_name'] = self.organization.name
+        if self.department_id:
+            data['department_name'] = self.department.name
+        if self.team_id:
+            data['team_name'] = self.team.name
+        return data
+
     def save(self, *args, **kwargs):
         """Save the contact and validate data"""
         skip_validation = kwargs.pop('skip_validation', False)
+        # Emails are stored lowercased on every path, including unvalidated saves
+        self.email = self.email.lower()
+        # Saves limited to columns without validation rules need no full_clean
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and VALIDATED_FIELDS.isdisjoint(update_fields):
+            skip_validation = True
         if not skip_validation:
             self.full_clean()
+        # The post_save receiver caches the contact
         super().save(*args, **kwargs)
-        # Cache the contact after saving
-        ContactCache.set_contact(self, include_related=True)
+
+    @classmethod
+    def bulk_create_contacts(cls, contacts, skip_validation=False, batch_size=500):
+        """Validate and insert contacts in batched queries, then cache them
+
+        Uniqueness is left to the database constraint instead of one
+        lookup per contact. Suited to imports and seed data.
+        """
+        for contact in contacts:
+            contact.email = contact.email.lower()
+            if not skip_validation:
+                contact.full_clean(validate_unique=False, validate_constraints=False)
+        # bulk_create bypasses save() and post_save, so cache explicitly
+        contacts = cls.objects.bulk_create(contacts, batch_size=batch_size)
+        ContactCache.bulk_set_contacts(contacts, include_related=True)
+        return contacts
 
     def hard_delete(self):
         """Hard delete the contact"""
-        org_id = self.organization_id
         self.delete(hard_delete=True)
-        # Invalidate cache after hard delete
-        ContactCache.delete_contact(self.id, org_id)
 
     def delete(self, *args, **kwargs):
-        """Delete the contact"""
+        """Delete the contact
+
+        The post_save and post_delete receivers keep the cache in sync.
+        """
         hard_delete = kwargs.pop('hard_delete', False)
-        org_id = self.organization_id
         if hard_delete:
             super().delete(*args, **kwargs)
-            # Invalidate cache after hard delete
-            ContactCache.delete_contact(self.id, org_id)
         else:
+            # Only the active flag changes, so write just that column
             self.is_active = False
-            self.save()
-            # Update cache with inactive status
-            ContactCache.set_contact(self, include_related=True)
+            self.save(update_fields=SOFT_DELETE_FIELDS)
 
     def clean(self):
         """Validate contact data"""
+        # Normalize the email once so stored values compare case-insensitively
+        self.email = self.email.lower()
+
         # Validate email format
         try:
             validate_email(self.email)
@@ -106,26 +190,35 @@ class Contact(TaskAwareModel):
             raise ValidationError({'email': ['Enter a valid email address.']})
 
         # Validate phone format (simple validation for demonstration)
-        phone_pattern = re.compile(r'^\+?1?\d{9,15}$')
-        if not phone_pattern.match(self.phone):
+        if not _valid_phone(self.phone):
             raise ValidationError({'phone': ['Enter a valid phone number (9-15 digits, optionally starting with + and country code).']})
 
         # Validate department belongs to organization
-        if self.department and self.department.organization != self.organization:
+        # Compare foreign key ids so the related organizations and departments are not fetched
+        if self.department_id and self.department.organization_id != self.organization_id:
             raise ValidationError({'department': ['Department must belong to the contact\'s organization.']})
 
         # Validate team belongs to department
-        if self.team:
-            if not self.department:
+        if self.team_id:
+            if not self.department_id:
                 raise ValidationError({'team': ['Cannot assign team without department.']})
-            if self.team.department != self.department:
+            if self.team.department_id != self.department_id:
                 raise ValidationError({'team': ['Team must belong to the contact\'s department.']})
 
 @receiver(post_save, sender=Contact)
-def contact_post_save(sender, instance, created, **kwargs):
-    """Update cache when contact is saved"""
-    ContactCache.set_contact(instance, include_related=True)
-    ContactCache.invalidate_organization_contacts(instance.organization_id)
+def contact_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the cache once the save is committed"""
+    contact_id, org_id = instance.pk, instance.organization_id
+    # A soft delete only needs the stale entries dropped, not a re-serialized contact
+    warm = not (update_fields and update_fields <= SOFT_DELETE_FIELDS)
+    transaction.on_commit(lambda: _refresh_contact_cache(contact_id, org_id, warm), robust=True)
+
+def _refresh_contact_cache(contact_id, org_id, warm=True):
+    """Drop the stale entries now and let a worker cache the saved contact"""
+    from .tasks import warm_contact_cache  # Import here to avoid circular import
+    ContactCache.delete_contact(contact_id, org_id)
+    if warm:
+        warm_contact_cache.delay(contact_id)
 
 @receiver(post_delete, sender=Contact)
 def contact_post_delete(sender, instance, **kwargs):
@@ -184,11 +277,10 @@ class ContactGroup(models.Model):
     def clean(self):
         """Validate the contact group"""
         super().clean()
-        if self.pk and self.contacts.exists():
-            # Check if all contacts belong to the same organization
-            contacts_orgs = self.contacts.values_list('organization', flat=True).distinct()
-            if len(contacts_orgs) > 1 or (len(contacts_orgs) == 1 and contacts_orgs[0] != self.organization.id):
-                raise ValidationError("All contacts must belong to the same organization as the group.")
+        # Check if all contacts belong to the same organization, stopping at the first mismatch
+        if self.pk and self.organization_id and \
+                self.contacts.exclude(organization_id=self.organization_id).exists():
+            raise ValidationError("All contacts must belong to the same organization as the group.")
 
     def delete(self, *args, **kwargs):
         """Delete the contact group"""
@@ -239,16 +331,27 @@ class ContactTemplate(models.Model):
         verbose_name_plural = 'Contact Templates'
         ordering = ['name']
         unique_together = ['name', 'organization']
+        indexes = [
+            models.Index(fields=['organization', 'is_active']),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored organization so clean() need not query it"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_org_id = instance.organization_id
+        return instance
+
     def save(self, *args, **kwargs):
         """Save the template and validate data"""
         skip_validation = kwargs.pop('skip_validation', False)
         if not skip_validation:
             self.full_clean()
         super().save(*args, **kwargs)
+        self._loaded_org_id = self.organization_id
 
     def hard_delete(self):
         """Hard delete the template"""
@@ -260,55 +363,32 @@ class ContactTemplate(models.Model):
         if hard_delete:
             super().delete(*args, **kwargs)
         else:
+            # Only the active flag changes, so write just that column
             self.is_active = False
-            self.save()
+            self.save(update_fields=SOFT_DELETE_FIELDS)
 
     def clean(self):
         """Validate template data"""
         # Validate required fields
         if not self.name:
             raise ValidationError({'name': ['Name is required.']})
-        if not self.organization:
+        if not self.organization_id:
             raise ValidationError({'organization': ['Organization is required.']})
 
         # Validate fields structure
-        if not isinstance(self.fields, dict):
-            raise ValidationError({'fields': ['Fields must be a dictionary.']})
-
-        # Validate each field in the template
-        valid_field_types = {'text', 'email', 'phone', 'select', 'number', 'date'}
-        for field_name, field_config in self.fields.items():
-            if not isinstance(field_config, dict):
-                raise ValidationError({
-                    'fields': [f'Field {field_name} configuration must be a dictionary.']
-                })
-            
-            # Check required field properties
-            if 'type' not in field_config:
-                raise ValidationError({
-                    'fields': [f'Field {field_name} must have a type.']
-                })
-            
-            if field_config['type'] not in valid_field_types:
-                raise ValidationError({
-                    'fields': [f'Invalid type for field {field_name}. Must be one of {valid_field_types}']
-                })
-            
-            # Check required property
-            if 'required' not in field_config:
-                raise ValidationError({
-                    'fields': [f'Field {field_name} must specify if it is required.']
-                })
-            
-            if not isinstance(field_config['required'], bool):
-                raise ValidationError({
-                    'fields': [f'Required property for field {field_name} must be a boolean.']
-                })
+        try:
+            validate_template_fields(self.fields)
+        except ValidationError as e:
+            raise ValidationError({'fields': e.error_list})
 
-        # Validate organization constraint
+        # Validate organization constraint against the stored organization
         if self.pk:  # Only check on update
-            original = ContactTemplate.objects.get(pk=self.pk)
-            if original.organization != self.organization:
+            original_org_id = self.__dict__.get('_loaded_org_id')
+            if original_org_id is None:
+                original_org_id = ContactTemplate.objects.filter(pk=self.pk).values_list(
+                    'organization_id', flat=True
+                ).get()
+            if original_org_id != self.organization_id:
                 raise ValidationError({
                     'organization': ['Cannot change the organization of a template.']
                 })
@@ -1,23 +1,39 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from Apps.entity.serializers import OrganizationSerializer, DepartmentSerializer, TeamSerializer
+from .models import Contact
+from .validation import validate_template_fields
+from django.core.exceptions import ValidationError as DjangoValidationError
 
 class ContactSerializer(serializers.ModelSerializer):
     """Serializer for Contact model"""
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     department_name = serializers.CharField(source='department.name', read_only=True)
     team_name = serializers.CharField(source='team.name', read_only=True)
+    email = serializers.EmailField(
+        max_length=254,
+        validators=[UniqueValidator(queryset=Contact.objects.all(), lookup='iexact')]
+    )
 
     class Meta:
-        from .models import Contact
         model = Contact
         fields = ('id', 'name', 'email', 'phone', 'organization', 'organization_name',
                  'department', 'department_name', 'team', 'team_name', 'is_active', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the relations whose names are serialized and load only the serialized columns"""
+        return queryset.select_related('organization', 'department', 'team').only(
+            'id', 'name', 'email', 'phone', 'is_active', 'created_at', 'updated_at',
+            'organization__name', 'department__name', 'team__name'
+        )
+
 class ContactGroupSerializer(serializers.ModelSerializer):
     """Serializer for ContactGroup model"""
     organization_name = serializers.CharField(source='organization.name', read_only=True)
-    contacts = ContactSerializer(many=True, read_only=True)
+    contacts = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
     contact_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
 
     class Meta:
@@ -27,6 +43,29 @@ class ContactGroupSerializer(serializers.ModelSerializer):
                  'contacts', 'contact_ids', 'is_active', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
+    @classmethod
+    def expand_contacts(cls, request):
+        """Whether the request asked for full contacts instead of ids (?expand=contacts)"""
+        return request is not None and request.query_params.get('expand') == 'contacts'
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, expand_contacts=False):
+        """Join the organization and prefetch the contacts, with their relations when expanded"""
+        from .models import Contact
+        if expand_contacts:
+            contacts = ContactSerializer.setup_eager_loading(Contact.objects.all())
+        else:
+            contacts = Contact.objects.only('id')
+        return queryset.select_related('organization').prefetch_related(
+            Prefetch('contacts', queryset=contacts)
+        )
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.expand_contacts(self.context.get('request')):
+            data['contacts'] = ContactSerializer(instance.contacts.all(), many=True).data
+        return data
+
     def create(self, validated_data):
         contact_ids = validated_data.pop('contact_ids', [])
         group = super().create(validated_data)
@@ -57,36 +96,33 @@ class ContactTemplateSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the organization and the users whose names are serialized"""
+        return queryset.select_related('organization', 'created_by', 'updated_by')
+
+    def validate_organization(self, value):
+        """Keep the organization of an existing template unchanged"""
+        if self.instance is not None and value.pk != self.instance.organization_id:
+            raise serializers.ValidationError('Cannot change the organization of a template.')
+        return value
+
     def validate_fields(self, value):
         """Validate the fields JSON structure"""
-        if not isinstance(value, dict):
-            raise serializers.ValidationError("Fields must be a dictionary.")
-        
-        valid_field_types = {'text', 'email', 'phone', 'select', 'number', 'date'}
-        for field_name, field_config in value.items():
-            if not isinstance(field_config, dict):
-                raise serializers.ValidationError(
-                    f"Field {field_name} configuration must be a dictionary."
-                )
-            
-            if 'type' not in field_config:
-                raise serializers.ValidationError(
-                    f"Field {field_name} must have a type."
-                )
-            
-            if field_config['type'] not in valid_field_types:
-                raise serializers.ValidationError(
-                    f"Invalid type for field {field_name}. Must be one of {valid_field_types}"
-                )
-            
-            if 'required' not in field_config:
-                raise serializers.ValidationError(
-                    f"Field {field_name} must specify if it is required."
-                )
-            
-            if not isinstance(field_config['required'], bool):
-                raise serializers.ValidationError(
-                    f"Required property for field {field_name} must be a boolean."
-                )
-        
-        return value 
\ No newline at end of file
+        try:
+            validate_template_fields(value)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return value
+
+    def create(self, validated_data):
+        # The serializer has checked everything full_clean would, so skip it in save
+        instance = self.Meta.model(**validated_data)
+        instance.save(skip_validation=True)
+        return instance
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(skip_validation=True)
+        return instance 
\ No newline at end of file
@@ -0,0 +1,16 @@
+from celery import shared_task
+from .cache_manager import ContactCache
+
+@shared_task(name='contacts.tasks.warm_contact_cache')
+def warm_contact_cache(contact_id):
+    """
+    Cache a saved contact outside the request cycle.
+    
+    Args:
+        contact_id (int): ID of the contact to cache
+    """
+    from .models import Contact  # Import here to avoid circular import
+    contact = Contact.objects.select_related('organization', 'department', 'team').filter(pk=contact_id).first()
+    # The contact may have been deleted before the worker ran
+    if contact is not None:
+        ContactCache.set_contact(contact, include_related=True)
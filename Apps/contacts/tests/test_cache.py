@@ -1 +1,140 @@
- 
\ No newline at end of file
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from Apps.contacts.cache_manager import ContactCache
+from Apps.contacts.models import Contact
+from Apps.contacts.serializers import ContactSerializer
+from Apps.contacts.tasks import warm_contact_cache
+from Apps.contacts.tests.factories import ContactFactory
+
+def run_cache_tasks():
+    """Run queued cache tasks inline instead of sending them to a broker"""
+    return patch('Apps.contacts.tasks.warm_contact_cache.delay', side_effect=warm_contact_cache)
+
+@pytest.mark.django_db
+class TestContactCache:
+    def setup_method(self):
+        cache.clear()
+
+    def test_bulk_set_contacts(self):
+        """Test bulk caching stores every contact and clears their organization caches"""
+        contacts = ContactFactory.create_batch(3)
+        org_id = contacts[0].organization_id
+        cache.set(ContactCache._get_org_contacts_key(org_id), ['stale'])
+
+        ContactCache.bulk_set_contacts(contacts)
+
+        for contact in contacts:
+            assert ContactCache.get_contact(contact.id) == contact
+        assert ContactCache.get_organization_contacts(org_id) is None
+
+    def test_bulk_set_contacts_with_related(self):
+        """Test bulk caching can store the serialized form like set_contact"""
+        contact = ContactFactory()
+
+        ContactCache.bulk_set_contacts([contact], include_related=True)
+
+        assert ContactCache.get_contact(contact.id)['email'] == contact.email
+
+    def test_bulk_set_contacts_batches_cache_calls(self):
+        """Test bulk caching uses one write and one invalidation call"""
+        contacts = ContactFactory.create_batch(3)
+
+        with patch('Apps.contacts.cache_manager.cache') as mock_cache:
+            ContactCache.bulk_set_contacts(contacts, ttl=60)
+
+        mock_cache.set_many.assert_called_once()
+        assert mock_cache.set_many.call_args.kwargs['timeout'] == 60
+        mock_cache.delete_many.assert_called_once()
+        mock_cache.set.assert_not_called()
+        mock_cache.delete.assert_not_called()
+
+    def test_bulk_set_organization_contacts(self, django_assert_num_queries):
+        """Test warming several organizations uses one query and caches each group"""
+        first, second = ContactFactory(), ContactFactory()
+        empty = ContactFactory().organization
+        Contact.objects.filter(organization=empty).delete()
+        org_ids = [first.organization_id, second.organization_id, empty.id]
+
+        with django_assert_num_queries(1):
+            ContactCache.bulk_set_organization_contacts(org_ids)
+
+        first.refresh_from_db()
+        assert ContactCache.get_organization_contacts(first.organization_id) == [first.to_cache_dict()]
+        assert [c['id'] for c in ContactCache.get_organization_contacts(second.organization_id)] == [second.id]
+        assert ContactCache.get_organization_contacts(empty.id) == []
+
+    def test_to_cache_dict_matches_serializer(self, django_capture_on_commit_callbacks):
+        """Test the cached dict has the same shape and values as the serializer"""
+        with run_cache_tasks(), django_capture_on_commit_callbacks(execute=True):
+            contact = ContactFactory()
+        contact.refresh_from_db()
+
+        assert contact.to_cache_dict() == ContactSerializer(contact).data
+        assert ContactCache.get_contact(contact.id) == contact.to_cache_dict()
+
+    def test_set_contact_pipelines_on_redis(self):
+        """Test the contact write and organization invalidation share one Redis pipeline"""
+        contact = ContactFactory()
+
+        with patch('Apps.contacts.cache_manager.cache') as mock_cache:
+            client = mock_cache.client
+            client.make_key.side_effect = lambda key: f'prefix:{key}'
+            ContactCache.set_contact(contact, ttl=60, include_related=True)
+
+        pipeline = client.get_client.return_value.pipeline.return_value
+        pipeline.set.assert_called_once_with(
+            f'prefix:contact:{contact.id}', client.encode.return_value, ex=60
+        )
+        pipeline.delete.assert_called_once_with(f'prefix:org:{contact.organization_id}:contacts')
+        pipeline.execute.assert_called_once()
+        mock_cache.set.assert_not_called()
+
+    def test_set_contact_falls_back_when_pipeline_fails(self):
+        """Test a failed pipeline falls back to sequential cache calls"""
+        contact = ContactFactory()
+
+        with patch('Apps.contacts.cache_manager.cache') as mock_cache:
+            mock_cache.client.get_client.side_effect = ConnectionError('down')
+            ContactCache.set_contact(contact, ttl=60)
+
+        mock_cache.set.assert_called_once_with(f'contact:{contact.id}', contact, timeout=60)
+        mock_cache.delete.assert_called_once_with(f'org:{contact.organization_id}:contacts')
+
+    def test_save_caches_contact_once(self, django_capture_on_commit_callbacks):
+        """Test saving a contact writes its cache entry once, after commit"""
+        contact = ContactFactory()
+
+        with run_cache_tasks(), patch.object(ContactCache, 'set_contact') as mock_set_contact:
+            with django_capture_on_commit_callbacks(execute=True) as callbacks:
+                contact.save()
+                # Nothing is cached until the transaction commits
+                mock_set_contact.assert_not_called()
+
+        assert len(callbacks) == 1
+        mock_set_contact.assert_called_once_with(contact, include_related=True)
+
+    def test_save_invalidates_then_queues_warm_up(self, django_capture_on_commit_callbacks):
+        """Test a committed save drops the stale entries and queues the cache task"""
+        contact = ContactFactory()
+        ContactCache.set_contact(contact)
+
+        with patch('Apps.contacts.tasks.warm_contact_cache.delay') as mock_delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                contact.save()
+
+        mock_delay.assert_called_once_with(contact.id)
+        assert ContactCache.get_contact(contact.id) is None
+
+    def test_soft_delete_drops_cache_without_warm_up(self, django_capture_on_commit_callbacks):
+        """Test a soft delete invalidates the contact without queueing a re-cache"""
+        contact = ContactFactory()
+        ContactCache.set_contact(contact)
+
+        with patch('Apps.contacts.tasks.warm_contact_cache.delay') as mock_delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                contact.delete()
+
+        mock_delay.assert_not_called()
+        assert ContactCache.get_contact(contact.id) is None
+        assert Contact.objects.get(pk=contact.pk).is_active is False
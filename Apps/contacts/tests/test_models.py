@@ -1,6 +1,8 @@
 import pytest
+from unittest.mock import patch
 from django.core.exceptions import ValidationError
-from Apps.contacts.models import Contact, ContactGroup, ContactTemplate
+from Apps.contacts.models import Contact, ContactGroup, ContactTemplate, _valid_phone
+from Apps.contacts.cache_manager import ContactCache
 from Apps.contacts.tests.factories import ContactFactory, ContactGroupFactory
 from django.test import TestCase
 from django.contrib.auth import get_user_model
@@ -8,6 +10,22 @@ from Apps.entity.models import Organization
 
 User = get_user_model()
 
+@pytest.mark.parametrize('phone,valid', [
+    ('123456789', True),
+    ('+123456789012345', True),
+    ('1123456789012345', True),
+    ('+1123456789012345', True),
+    ('2123456789012345', False),
+    ('12345678', False),
+    ('+', False),
+    ('', False),
+    ('123-456-7890', False),
+    ('123456789\n', False),
+])
+def test_valid_phone(phone, valid):
+    """Test the phone check accepts 9-15 digits after an optional + and country code 1"""
+    assert _valid_phone(phone) is valid
+
 @pytest.mark.django_db
 class TestContact:
     def test_create_contact(self):
@@ -46,6 +64,94 @@ class TestContact:
         with pytest.raises(ValidationError):
             ContactFactory(email=contact.email)
 
+    def test_email_is_normalized_and_unique_ignoring_case(self):
+        """Test emails are stored lowercase and duplicates differing by case are rejected"""
+        contact = ContactFactory(email='Mixed.Case@Example.com')
+        assert contact.email == 'mixed.case@example.com'
+
+        with pytest.raises(ValidationError):
+            ContactFactory(email='MIXED.CASE@example.com')
+
+    def test_email_is_normalized_without_validation(self):
+        """Test saves that skip full_clean still store the email lowercase"""
+        contact = ContactFactory()
+        contact.email = 'Skipped.Clean@Example.com'
+        contact.save(skip_validation=True)
+        contact.refresh_from_db()
+        assert contact.email == 'skipped.clean@example.com'
+
+        contact.email = 'Partial.Save@Example.com'
+        contact.save(update_fields=['email', 'is_active'])
+        contact.refresh_from_db()
+        assert contact.email == 'partial.save@example.com'
+
+    def test_save_validates_only_when_validated_fields_change(self):
+        """Test partial saves of unvalidated columns skip full_clean"""
+        contact = ContactFactory()
+
+        with patch.object(Contact, 'full_clean') as mock_full_clean:
+            contact.save(update_fields=['is_active'])
+            mock_full_clean.assert_not_called()
+
+            contact.save(update_fields=['is_active', 'phone'])
+            mock_full_clean.assert_called_once()
+
+    def test_bulk_create_contacts(self):
+        """Test bulk creating validated contacts and caching them"""
+        template = ContactFactory()
+        contacts = [
+            Contact(name=f'Bulk {i}', email=f'bulk{i}@example.com', phone='+12345678901',
+                    organization=template.organization, department=template.department, team=template.team)
+            for i in range(3)
+        ]
+
+        created = Contact.bulk_create_contacts(contacts)
+
+        assert Contact.objects.filter(email__startswith='bulk').count() == 3
+        for contact in created:
+            assert ContactCache.get_contact(contact.id)['email'] == contact.email
+
+    def test_bulk_create_contacts_in_batches(self, django_assert_num_queries):
+        """Test bulk creation splits the insert into batches and skips validation on request"""
+        organization = ContactFactory().organization
+        contacts = [
+            Contact(name=f'Seed {i}', email=f'seed{i}@example.com', phone='+12345678901', organization=organization)
+            for i in range(5)
+        ]
+
+        with django_assert_num_queries(3):
+            Contact.bulk_create_contacts(contacts, skip_validation=True, batch_size=2)
+
+        assert Contact.objects.filter(email__startswith='seed').count() == 5
+
+    def test_bulk_create_contacts_normalizes_emails(self, django_assert_num_queries):
+        """Test bulk creation lowercases emails and validates without per-contact queries"""
+        contacts = [
+            Contact(name=f'Import {i}', email=f'Import{i}@Example.com', phone='+12345678901')
+            for i in range(5)
+        ]
+
+        with django_assert_num_queries(3):
+            Contact.bulk_create_contacts(contacts, batch_size=2)
+
+        assert sorted(Contact.objects.filter(name__startswith='Import').values_list('email', flat=True)) == [
+            f'import{i}@example.com' for i in range(5)
+        ]
+
+    def test_bulk_create_contacts_validates(self):
+        """Test bulk creation rejects invalid contacts before inserting any"""
+        template = ContactFactory()
+        contacts = [
+            Contact(name='Valid', email='valid@example.com', phone='+12345678901',
+                    organization=template.organization),
+            Contact(name='Invalid', email='invalid@example.com', phone='invalid',
+                    organization=template.organization),
+        ]
+
+        with pytest.raises(ValidationError):
+            Contact.bulk_create_contacts(contacts)
+        assert not Contact.objects.filter(email='valid@example.com').exists()
+
     def test_contact_validation(self):
         """Test contact validation"""
         # Test invalid email
@@ -104,6 +210,16 @@ class TestContactGroup:
         assert contact not in group.contacts.all()
         assert group not in contact.groups.all()
 
+    def test_group_contacts_must_share_organization(self):
+        """Test validation rejects contacts from another organization"""
+        group = ContactGroupFactory()
+        group.contacts.add(ContactFactory(organization=group.organization))
+        group.clean()
+
+        group.contacts.add(ContactFactory())
+        with pytest.raises(ValidationError, match='same organization'):
+            group.clean()
+
 class ContactTemplateTests(TestCase):
     """Test cases for ContactTemplate model"""
     
@@ -180,6 +296,15 @@ class ContactTemplateTests(TestCase):
         with self.assertRaises(ValidationError):
             template.save()
 
+    def test_template_update_does_not_reload_organization(self):
+        """Test updating a loaded template checks the organization without a query"""
+        template = ContactTemplate.objects.get(pk=ContactTemplate.objects.create(**self.template_data).pk)
+        template.description = 'Updated'
+
+        # Foreign key and unique_together checks plus the UPDATE; the stored row is not re-read
+        with self.assertNumQueries(4):
+            template.save()
+
     def test_template_fields_validation(self):
         """Test fields validation"""
         # Test missing required field type
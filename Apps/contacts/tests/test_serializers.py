@@ -0,0 +1,143 @@
+import pytest
+from unittest.mock import patch
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from Apps.contacts.models import Contact, ContactGroup, ContactTemplate
+from Apps.contacts.serializers import ContactSerializer, ContactGroupSerializer, ContactTemplateSerializer
+from Apps.contacts.tests.factories import ContactFactory, ContactGroupFactory
+from Apps.entity.tests.factories import OrganizationFactory
+from Apps.core.tests.factories import UserFactory
+
+
+@pytest.mark.django_db
+class TestEagerLoading:
+    def test_contact_list_uses_one_query(self, django_assert_num_queries):
+        """Test serializing contacts does not query per related name"""
+        ContactFactory.create_batch(3)
+        queryset = ContactSerializer.setup_eager_loading(Contact.objects.all())
+
+        with django_assert_num_queries(1):
+            data = ContactSerializer(queryset, many=True).data
+
+        assert len(data) == 3
+        assert all(contact['organization_name'] for contact in data)
+        assert {'created_by_id', 'updated_by_id'} <= queryset[0].get_deferred_fields()
+
+    def test_contact_group_list_returns_contact_ids(self, django_assert_num_queries):
+        """Test serializing groups lists contact ids loaded in one extra query"""
+        groups = ContactGroupFactory.create_batch(2)
+        for group in groups:
+            group.contacts.add(*ContactFactory.create_batch(2, organization=group.organization))
+        queryset = ContactGroupSerializer.setup_eager_loading(ContactGroup.objects.all())
+
+        with django_assert_num_queries(2):
+            data = ContactGroupSerializer(queryset, many=True).data
+
+        assert [sorted(group['contacts']) for group in data] == [
+            sorted(group.contacts.values_list('id', flat=True)) for group in groups
+        ]
+
+    def test_contact_group_list_expands_contacts(self, django_assert_num_queries):
+        """Test ?expand=contacts nests the full contacts without extra queries per group"""
+        for group in ContactGroupFactory.create_batch(2):
+            group.contacts.add(*ContactFactory.create_batch(2, organization=group.organization))
+        request = Request(APIRequestFactory().get('/', {'expand': 'contacts'}))
+        queryset = ContactGroupSerializer.setup_eager_loading(
+            ContactGroup.objects.all(),
+            expand_contacts=ContactGroupSerializer.expand_contacts(request)
+        )
+
+        with django_assert_num_queries(2):
+            data = ContactGroupSerializer(queryset, many=True, context={'request': request}).data
+
+        assert [len(group['contacts']) for group in data] == [2, 2]
+        assert all(contact['organization_name'] for group in data for contact in group['contacts'])
+
+
+@pytest.mark.django_db
+def test_contact_email_unique_ignoring_case():
+    """Test the serializer rejects an email that differs from an existing one only by case"""
+    contact = ContactFactory()
+    serializer = ContactSerializer(data={
+        'name': 'Duplicate',
+        'email': contact.email.upper(),
+        'phone': '+12345678901'
+    })
+
+    assert not serializer.is_valid()
+    assert 'email' in serializer.errors
+
+
+@pytest.mark.django_db
+class TestContactTemplateSerializer:
+    fields = {'name': {'required': True, 'type': 'text'}}
+
+    def test_template_list_uses_one_query(self, django_assert_num_queries):
+        """Test serializing templates joins the organization and users"""
+        for _ in range(3):
+            ContactTemplate.objects.create(
+                name='Template', organization=OrganizationFactory(), fields=self.fields,
+                created_by=UserFactory(), updated_by=UserFactory()
+            )
+        queryset = ContactTemplateSerializer.setup_eager_loading(ContactTemplate.objects.all())
+
+        with django_assert_num_queries(1):
+            data = ContactTemplateSerializer(queryset, many=True).data
+
+        assert all(template['created_by_name'] and template['updated_by_name'] for template in data)
+
+    def test_save_validates_once(self):
+        """Test a validated serializer saves without running full_clean again"""
+        serializer = ContactTemplateSerializer(data={
+            'name': 'Template',
+            'organization': OrganizationFactory().id,
+            'fields': self.fields
+        })
+        assert serializer.is_valid(), serializer.errors
+
+        with patch.object(ContactTemplate, 'full_clean') as mock_full_clean:
+            template = serializer.save()
+
+        mock_full_clean.assert_not_called()
+        assert ContactTemplate.objects.get(pk=template.pk).fields == self.fields
+
+    def test_invalid_fields(self):
+        """Test field structure errors are reported by the serializer"""
+        serializer = ContactTemplateSerializer(data={
+            'name': 'Template',
+            'organization': OrganizationFactory().id,
+            'fields': {'name': {'type': 'text'}}
+        })
+
+        assert not serializer.is_valid()
+        assert serializer.errors['fields'] == ['Field name must specify if it is required.']
+
+    def test_invalid_fields_reports_every_field(self):
+        """Test each invalid field gets its own message"""
+        serializer = ContactTemplateSerializer(data={
+            'name': 'Template',
+            'organization': OrganizationFactory().id,
+            'fields': {
+                'name': {'required': True, 'type': 'text'},
+                'age': {'type': 'integer', 'required': True},
+                'notes': 'text'
+            }
+        })
+
+        assert not serializer.is_valid()
+        assert serializer.errors['fields'] == [
+            "Invalid type for field age. Must be one of ['date', 'email', 'number', 'phone', 'select', 'text']",
+            'Field notes configuration must be a dictionary.'
+        ]
+
+    def test_organization_cannot_change(self):
+        """Test updates cannot move a template to another organization"""
+        template = ContactTemplate.objects.create(
+            name='Template', organization=OrganizationFactory(), fields=self.fields
+        )
+        serializer = ContactTemplateSerializer(
+            template, data={'organization': OrganizationFactory().id}, partial=True
+        )
+
+        assert not serializer.is_valid()
+        assert 'organization' in serializer.errors
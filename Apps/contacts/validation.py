@@ -0,0 +1,52 @@
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+# Field types a ContactTemplate may define
+TEMPLATE_FIELD_TYPES = frozenset({'text', 'email', 'phone', 'select', 'number', 'date'})
+
+
+def _field_error(message, code, field_name):
+    return ValidationError(message, code=code, params={'field': field_name})
+
+
+def validate_template_fields(value):
+    """
+    Validate the fields structure of a contact template
+
+    Raises a single ValidationError listing the first problem of each invalid
+    field. Messages are formatted only when they are rendered.
+    """
+    if not isinstance(value, dict):
+        raise ValidationError(_('Fields must be a dictionary.'), code='invalid')
+
+    errors = []
+    for field_name, field_config in value.items():
+        if not isinstance(field_config, dict):
+            errors.append(_field_error(
+                _('Field %(field)s configuration must be a dictionary.'), 'invalid_config', field_name
+            ))
+            continue
+
+        # Check required field properties
+        if 'type' not in field_config:
+            errors.append(_field_error(_('Field %(field)s must have a type.'), 'missing_type', field_name))
+        elif field_config['type'] not in TEMPLATE_FIELD_TYPES:
+            errors.append(ValidationError(
+                _('Invalid type for field %(field)s. Must be one of %(types)s'),
+                code='invalid_type',
+                params={'field': field_name, 'types': sorted(TEMPLATE_FIELD_TYPES)}
+            ))
+            continue
+
+        # Check required property
+        if 'required' not in field_config:
+            errors.append(_field_error(
+                _('Field %(field)s must specify if it is required.'), 'missing_required', field_name
+            ))
+        elif not isinstance(field_config['required'], bool):
+            errors.append(_field_error(
+                _('Required property for field %(field)s must be a boolean.'), 'invalid_required', field_name
+            ))
+
+    if errors:
+        raise ValidationError(errors)
@@ -14,9 +14,13 @@ class ContactViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter contacts by organization"""
         organization_id = self.request.query_params.get('organization', None)
+        queryset = Contact.objects.all()
+        # Writes save and validate the whole row, so only narrow read queries
+        if self.action in ('list', 'retrieve'):
+            queryset = ContactSerializer.setup_eager_loading(queryset)
         if organization_id:
-            return Contact.objects.filter(organization_id=organization_id)
-        return Contact.objects.all()
+            return queryset.filter(organization_id=organization_id)
+        return queryset
 
 class ContactGroupViewSet(viewsets.ModelViewSet):
     """ViewSet for ContactGroup model"""
@@ -27,9 +31,13 @@ class ContactGroupViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter contact groups by organization"""
         organization_id = self.request.query_params.get('organization', None)
+        queryset = ContactGroupSerializer.setup_eager_loading(
+            ContactGroup.objects.all(),
+            expand_contacts=ContactGroupSerializer.expand_contacts(self.request)
+        )
         if organization_id:
-            return ContactGroup.objects.filter(organization_id=organization_id)
-        return ContactGroup.objects.all()
+            return queryset.filter(organization_id=organization_id)
+        return queryset
 
 class ContactTemplateViewSet(viewsets.ModelViewSet):
     """ViewSet for ContactTemplate model"""
@@ -40,9 +48,10 @@ class ContactTemplateViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter templates by organization"""
         organization_id = self.request.query_params.get('organization', None)
+        queryset = ContactTemplateSerializer.setup_eager_loading(ContactTemplate.objects.all())
         if organization_id:
-            return ContactTemplate.objects.filter(organization_id=organization_id)
-        return ContactTemplate.objects.all()
+            return queryset.filter(organization_id=organization_id)
+        return queryset
 
     def perform_create(self, serializer):
         """Set created_by and updated_by on create"""
@@ -9,10 +9,9 @@ class CurrentUserMiddleware:
         if hasattr(request, 'user'):
             set_current_user(request.user)
         
-        # Process the request
-        response = self.get_response(request)
-        
-        # Clear the current user from thread local storage
-        set_current_user(None)
-        
-        return response 
\ No newline at end of file
+        try:
+            # Process the request
+            return self.get_response(request)
+        finally:
+            # Clear the current user from thread local storage, even on errors
+            set_current_user(None) 
\ No newline at end of file
@@ -1,5 +1,6 @@
+from functools import lru_cache
+from django.apps import apps
 from django.db import models
-from django.contrib.contenttypes.models import ContentType
 
 class ImportExportMixin:
     """Mixin to add import/export capabilities to any model."""
@@ -22,10 +23,13 @@ class ImportExportMixin:
     @staticmethod
     def get_import_export_enabled_models():
         """Get all models that have import/export enabled."""
-        enabled_models = []
-        for model in ContentType.objects.all():
-            model_class = model.model_class()
-            if model_class and hasattr(model_class, 'is_import_export_enabled'):
-                if model_class.is_import_export_enabled():
-                    enabled_models.append(model.model)
-        return enabled_models 
\ No newline at end of file
+        return list(_import_export_enabled_models())
+
+
+@lru_cache(maxsize=1)
+def _import_export_enabled_models():
+    """Names of the enabled models, resolved once from the app registry."""
+    return tuple(
+        model._meta.model_name for model in apps.get_models()
+        if hasattr(model, 'is_import_export_enabled') and model.is_import_export_enabled()
+    )
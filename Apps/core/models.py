@@ -1,12 +1,11 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
 from django.utils import timezone
 from typing import Optional, Dict, Any, ClassVar
 from dataclasses import dataclass
 from enum import Enum
+from threading import local
 from .mixins import ImportExportMixin
 
 User = get_user_model()
@@ -148,10 +147,24 @@ class BaseModel(ImportExportMixin, TaskAwareModel):
         super().clean()
 
     def save(self, *args, **kwargs):
-        """Save the model with validation"""
-        self.full_clean()
+        """
+        Save the model with validation and stamp the audit fields.
+        Pass skip_validation=True when the instance is already validated.
+        """
+        if not kwargs.pop('skip_validation', False):
+            self.full_clean()
+        self.set_user_fields()
         super().save(*args, **kwargs)
 
+    def set_user_fields(self):
+        """Set created_by and updated_by from the current user"""
+        user = get_current_user()
+        if user is None or not user.is_authenticated:
+            return
+        if not self.pk:  # New instance
+            self.created_by = user
+        self.updated_by = user
+
     def delete(self, hard=False, *args, **kwargs):
         """
         Soft delete the object by setting is_active to False.
@@ -160,37 +173,25 @@ class BaseModel(ImportExportMixin, TaskAwareModel):
         if hard:
             super().delete(*args, **kwargs)
         else:
+            # Only the active flag and audit columns change, so skip validation
             self.is_active = False
-            self.save()
+            self.save(skip_validation=True, update_fields=['is_active', 'updated_at', 'updated_by'])
 
     def hard_delete(self):
         """Hard delete the object"""
         models.Model.delete(self)
 
+# Per-thread storage for the user of the request being handled
+_thread_locals = local()
+
 def get_current_user():
     """Get the current user from the thread local storage"""
-    from threading import local
-    _thread_locals = local()
     return getattr(_thread_locals, 'user', None)
 
 def set_current_user(user):
     """Set the current user in the thread local storage"""
-    from threading import local
-    _thread_locals = local()
     _thread_locals.user = user
 
-@receiver(pre_save)
-def set_user_fields(sender, instance, **kwargs):
-    """Set created_by and updated_by fields before saving"""
-    if not isinstance(instance, BaseModel):
-        return
-
-    user = get_current_user()
-    if user and user.is_authenticated:
-        if not instance.pk:  # New instance
-            instance.created_by = user
-        instance.updated_by = user 
-
 class Config(BaseModel):
     """Model for storing system-wide configuration settings"""
     key = models.CharField(max_length=255, unique=True)
@@ -222,11 +223,6 @@ class Config(BaseModel):
             if original.value != self.value:
                 raise ValidationError("This configuration setting cannot be modified")
 
-    def save(self, *args, **kwargs):
-        """Save the configuration and validate data"""
-        self.full_clean()
-        super().save(*args, **kwargs)
-
     def delete(self, *args, **kwargs):
         """Prevent deletion of non-editable configurations"""
         if not self.is_editable:
@@ -3,9 +3,11 @@ from django.test import TestCase
 from django.db import models, connection, transaction
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from Apps.core.models import BaseModel
+from Apps.core.middleware import CurrentUserMiddleware
+from Apps.core.models import BaseModel, get_current_user, set_current_user
 from Apps.core.tests.factories import UserFactory, BaseModelFactory
 import time
+from unittest.mock import patch
 
 User = get_user_model()
 
@@ -74,6 +76,54 @@ class TestBaseModel(TestCase):
         model = TestModel.objects.create(name='Test')
         self.assertEqual(str(model), 'Test')
 
+    def test_current_user_sets_audit_fields(self):
+        """Test the current user is kept and stamped on saves."""
+        set_current_user(self.user)
+        try:
+            self.assertEqual(get_current_user(), self.user)
+            model = TestModel.objects.create(name='Test')
+        finally:
+            set_current_user(None)
+        self.assertEqual(model.created_by, self.user)
+        self.assertEqual(model.updated_by, self.user)
+
+    def test_middleware_clears_current_user_on_error(self):
+        """Test the middleware clears the current user when the view raises."""
+        def view(request):
+            raise RuntimeError('boom')
+        request = type('Request', (), {'user': self.user})()
+        with self.assertRaises(RuntimeError):
+            CurrentUserMiddleware(view)(request)
+        self.assertIsNone(get_current_user())
+
+    def test_skip_validation(self):
+        """Test skip_validation saves without running full_clean."""
+        model = TestModel(name='Test')
+        with patch.object(TestModel, 'full_clean') as mock_full_clean:
+            model.save(skip_validation=True)
+            mock_full_clean.assert_not_called()
+            model.save()
+            mock_full_clean.assert_called_once()
+
+    def test_delete_soft_deletes_without_validation(self):
+        """Test delete() writes only the active flag and audit columns."""
+        model = TestModel.objects.create(name='Test')
+        TestModel.all_objects.filter(pk=model.pk).update(name='Changed elsewhere')
+        with patch.object(TestModel, 'full_clean') as mock_full_clean:
+            model.delete()
+        mock_full_clean.assert_not_called()
+        stored = TestModel.all_objects.get(pk=model.pk)
+        self.assertFalse(stored.is_active)
+        self.assertEqual(stored.name, 'Changed elsewhere')
+
+    def test_import_export_enabled_models(self):
+        """Test enabled models come from the app registry without queries."""
+        with self.assertNumQueries(0):
+            enabled = BaseModel.get_import_export_enabled_models()
+        self.assertIn('testmodel', enabled)
+        self.assertIn('config', enabled)
+        self.assertNotIn('user', enabled)
+
 @pytest.mark.django_db
 class TestUser:
     @pytest.fixture(autouse=True)
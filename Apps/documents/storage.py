@@ -1,7 +1,6 @@
 import os
 import uuid
 from django.core.files.storage import FileSystemStorage
-from django.conf import settings
 from django.utils import timezone
 
 class DocumentStorage(FileSystemStorage):
@@ -10,7 +9,8 @@ class DocumentStorage(FileSystemStorage):
     Implements organization by date and document ID.
     """
     def __init__(self, location=None, base_url=None):
-        super().__init__(location=location or settings.MEDIA_ROOT, base_url=base_url)
+        # Without a location, FileSystemStorage follows MEDIA_ROOT, including overrides
+        super().__init__(location=location, base_url=base_url)
 
     def get_upload_path(self, name, user):
         """Generate a unique path for uploaded files."""
@@ -44,12 +44,10 @@ class Organization(BaseModel):
         """Save the organization and validate data"""
         skip_validation = kwargs.pop('skip_validation', False)
         validate_unique = kwargs.pop('validate_unique', True)
-        if skip_validation:
-            super().save(*args, **kwargs)
-        else:
-            if validate_unique:
-                self.full_clean()
-            super().save(*args, **kwargs)
+        if not skip_validation and validate_unique:
+            self.full_clean()
+        # Validation is settled above, so BaseModel must not repeat it
+        super().save(*args, skip_validation=True, **kwargs)
 
     def hard_delete(self):
         """Hard delete the organization and all its departments"""
@@ -100,13 +98,12 @@ class Department(BaseModel):
 
     def save(self, *args, **kwargs):
         """Save the department and validate hierarchy"""
-        if kwargs.pop('skip_validation', False):
-            super().save(*args, **kwargs)
-        else:
+        if not kwargs.pop('skip_validation', False):
             if not self.organization_id:
                 raise IntegrityError("Organization is required.")
             self.full_clean()
-            super().save(*args, **kwargs)
+        # Validation is settled above, so BaseModel must not repeat it
+        super().save(*args, skip_validation=True, **kwargs)
 
     def hard_delete(self):
         """Hard delete the department and all its child departments"""
@@ -286,11 +283,6 @@ class OrganizationSettings(BaseModel):
             if not isinstance(self.notification_preferences[key], bool):
                 raise ValidationError({"notification_preferences": f"Value for {key} must be boolean"})
 
-    def save(self, *args, **kwargs):
-        """Save the organization settings with validation"""
-        self.full_clean()
-        super().save(*args, **kwargs)
-
     @classmethod
     def get_default_notification_preferences(cls):
         """Get default notification preferences"""
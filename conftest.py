@@ -5,6 +5,7 @@ Test configuration file for pytest.
 import os
 import sys
 import django
+import pytest
 from django.conf import settings
 
 # Add the project root directory to the Python path
@@ -16,4 +17,13 @@ sys.path.insert(0, os.path.join(PROJECT_ROOT, 'Apps'))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Core.settings_test')
 
 # Initialize Django
-django.setup() 
\ No newline at end of file
+django.setup() 
+
+
+@pytest.fixture(scope='session', autouse=True)
+def media_root(tmp_path_factory):
+    """Keep files written by tests out of the project's media directory."""
+    from django.test import override_settings
+
+    with override_settings(MEDIA_ROOT=str(tmp_path_factory.mktemp('media'))):
+        yield